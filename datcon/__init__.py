@@ -1,12 +1,49 @@
 from .datcon import *
+from .datarray import DatArray
+from .ticks import TickDat
+from .offsets import OffsetRule
+from .stream import convert_stream
+from .interval import DatInterval, merge_intervals, overlap_join, points_in_intervals
+from .buckets import resample
+from .window import SlidingWindow
+from .archive import DatArchive
+from .index import DatIndex
+from .formatting import DatFormat, format_many
+from .instrument import enable_instrumentation, disable_instrumentation, reset_instrumentation, instrumentation_snapshot, instrumented
 from .version import __version__
 
 __all__ = [
     "dat",
     "dat_support",
     "Maths_Support",
+    "Duration",
     "AC",
     "BC",
     "EpochType",
+    "dump_many",
+    "load_many",
+    "enable_calendar_cache",
+    "disable_calendar_cache",
+    "clear_calendar_cache",
+    "calendar_cache_info",
+    "DatArray",
+    "TickDat",
+    "OffsetRule",
+    "convert_stream",
+    "DatInterval",
+    "merge_intervals",
+    "overlap_join",
+    "points_in_intervals",
+    "resample",
+    "SlidingWindow",
+    "DatArchive",
+    "DatIndex",
+    "DatFormat",
+    "format_many",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "reset_instrumentation",
+    "instrumentation_snapshot",
+    "instrumented",
     "__version__",
 ]
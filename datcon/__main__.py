@@ -0,0 +1,71 @@
+"""
+Command-line bulk converter: `python -m datcon TEMPLATE [INPUT] [options]`.
+
+reads timestamps (one per line, or a CSV column) from INPUT or stdin, parses them with the `stamp` TEMPLATE
+and writes one rawtime, or one --format formatted value, per row, see `datcon.convert_stream`
+"""
+from __future__ import annotations
+import argparse
+import sys
+
+from .datcon import AC, BC
+from .formatting import compile_format
+from .offsets import OffsetRule
+from .stream import convert_stream
+
+# named rules accepted by --drift next to plain seconds
+RULES:dict = {
+    "cet": OffsetRule.central_european,
+}
+
+def _drift(text: str):
+    if text.lower() in RULES:
+        return RULES[text.lower()]()
+    try:
+        return float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"drift has to be a number of seconds or one of {sorted(RULES)}, got {text!r}")
+
+def _column(text: str) -> int | str:
+    return int(text) if text.isdigit() else text
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m datcon", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("template", help='stamp template of the input, e.g. "y-m-d h:mi:s"')
+    parser.add_argument("input", nargs="?", default="-", help="input file, stdin when missing or -")
+    parser.add_argument("-o", "--output", default="-", help="output file, stdout when missing or -")
+    parser.add_argument("-f", "--format", dest="pattern", help='write this strftime-style format (e.g. "%%Y-%%m-%%dT%%H:%%M:%%S") instead of the rawtime')
+    parser.add_argument("--drift", type=_drift, default=0, help=f"drift in seconds or a named offset rule ({', '.join(RULES)})")
+    parser.add_argument("--bc", action="store_true", help="read the timestamps as BC")
+    parser.add_argument("-c", "--column", type=_column, help="read this CSV column (number, or name with --header)")
+    parser.add_argument("-d", "--delimiter", default=",", help="CSV delimiter (default ,)")
+    parser.add_argument("--header", action="store_true", help="the first input row is a header and is skipped")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default one per CPU, 1 for no pool)")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="rows per work unit (default 20000)")
+    args = parser.parse_args(argv)
+
+    # a bad --format is reported before -o is opened, opening it truncates whatever the file held
+    if args.pattern is not None:
+        try:
+            compile_format(args.pattern)
+        except ValueError as error:
+            parser.error(str(error))
+
+    source = destination = None
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+        destination = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        convert_stream(source, destination, args.template, epoch_type=BC if args.bc else AC, drift=args.drift,
+                       pattern=args.pattern, column=args.column, delimiter=args.delimiter, header=args.header,
+                       workers=args.workers, chunk_size=args.chunk_size)
+    except (ValueError, OSError) as error:
+        parser.error(str(error))
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+        if destination not in (None, sys.stdout):
+            destination.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
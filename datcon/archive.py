@@ -0,0 +1,130 @@
+from __future__ import annotations
+import mmap
+import struct
+
+from .datcon import dat, _key, _RECORD, RECORD_SIZE
+
+__all__ = ["DatArchive"]
+
+_HEADER = struct.Struct("<4sHHQ")  # magic, format version, record size, record count
+_MAGIC = b"DATA"
+_VERSION = 1
+
+class DatArchive:
+    """Read-only, memory-mapped archive of dat records sorted by rawtime. The file is a small header followed by the same fixed-width rawtime/drift records `dat.to_bytes` produces, so `between` and `nearest` run a binary search straight on the mapped pages and never load the file into memory. Results are lazy dat objects that only decompose their rawtime when used."""
+
+    def __init__(self, path):
+        """Open the archive at `path` and map it read-only. Raises ValueError if the file is not a dat archive."""
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size, count = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC or version != _VERSION or record_size != RECORD_SIZE:
+                raise ValueError(f"{path!r} is not a version {_VERSION} dat archive")
+            if len(self._map) < _HEADER.size + count * RECORD_SIZE:
+                raise ValueError(f"{path!r} is truncated, expected {count} records")
+        except BaseException:
+            self.close()
+            raise
+        self._count:int = count
+
+    @classmethod
+    def write(cls, path, dats, *, presorted: bool = False) -> int:
+        """
+        writes an archive with every dat of `dats` to `path` and returns the number of records,\n
+        records are sorted by rawtime in memory unless `presorted=True`, in which case they are streamed
+        straight to disk and a ValueError is raised at the first record out of order
+        """
+        if not presorted:
+            dats = sorted(dats, key=lambda item: item.rawtime)
+        pack = _RECORD.pack
+        count = 0
+        previous = float("-inf")
+        with open(path, "wb") as fp:
+            fp.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_SIZE, 0))
+            for item in dats:
+                if item.rawtime < previous:
+                    raise ValueError(f"record {count} is out of order, pass presorted=False to sort the input")
+                previous = item.rawtime
+                fp.write(pack(item.rawtime, item.drift))
+                count += 1
+            fp.seek(0)
+            fp.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_SIZE, count))
+        return count
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> DatArchive:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _rawtime_at(self, index: int) -> float:
+        return _RECORD.unpack_from(self._map, _HEADER.size + index * RECORD_SIZE)[0]
+
+    def _view(self, index: int) -> dat:
+        rawtime, drift = _RECORD.unpack_from(self._map, _HEADER.size + index * RECORD_SIZE)
+        return dat.input_compiler(rawtime, drift=drift, output=None)
+
+    def __getitem__(self, index: int) -> dat:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("archive index out of range")
+        return self._view(index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._view(index)
+
+    def bisect_left(self, value: dat | float | int) -> int:
+        "index of the first record with rawtime >= value"
+        value = _key(value)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._rawtime_at(middle) < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def bisect_right(self, value: dat | float | int) -> int:
+        "index of the first record with rawtime > value"
+        value = _key(value)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if value < self._rawtime_at(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def between(self, start_dat: dat | float | int, end_dat: dat | float | int):
+        "yields every record with `start_dat <= rawtime <= end_dat`, in order"
+        for index in range(self.bisect_left(start_dat), self.bisect_right(end_dat)):
+            yield self._view(index)
+
+    def nearest(self, target: dat | float | int) -> dat | None:
+        "record whose rawtime is closest to `target` (the earlier one on ties), None for an empty archive"
+        if not self._count:
+            return None
+        value = _key(target)
+        index = self.bisect_left(value)
+        if index == self._count:
+            return self._view(index - 1)
+        if index > 0 and value - self._rawtime_at(index - 1) <= self._rawtime_at(index) - value:
+            return self._view(index - 1)
+        return self._view(index)
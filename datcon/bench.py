@@ -0,0 +1,122 @@
+"""
+Offline benchmark suite for datcon.
+
+times construction (stamp with list and string input, datetime, operand), every Maths_Support operator,
+__str__, the _convert_to_ properties and the export_compiler / input_compiler round trip, sweeping the year
+from 1 to 100000 plus BC values, and measures the memory held per object.
+
+run it with `python -m datcon.bench [--quick] [--output results.json]`, results are printed (or written) as JSON
+so runs can be compared, every timing entry is `{"case", "year", "era", "ops_per_sec", "loops"}`
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .datcon import dat, AC, BC
+from .version import __version__
+
+YEARS:tuple[int] = (1, 100, 2000, 10000, 100000)
+ERAS:tuple = (AC, BC)
+
+def _cases(year: int, era) -> dict:
+    "name -> zero argument callable, all built around the same instant of `year` in `era`"
+    components = [year, 6, 15, 12, 30, 45.5]
+    text = f"{year:04}-06-15 12:30:45.5"
+    sample = dat.datetime(components, era)
+    rawtime = sample.rawtime
+    other = dat.datetime([1, 1, 2, 3, 4, 5])
+    exported = sample.export_compiler
+
+    cases = {
+        "stamp_list": lambda: dat.stamp(components, epoch_type=era),
+        "stamp_str": lambda: dat.stamp(text, "y-m-d h:mi:s", era),
+        "datetime": lambda: dat.datetime(components, era),
+        "operand": lambda: dat.operand(rawtime),
+        "operand_str": lambda: str(dat.operand(rawtime)),
+        "str": lambda: str(sample),
+        "export_input_round_trip": lambda: dat.input_compiler(chunk_input=sample.export_compiler),
+        "input_compiler": lambda: dat.input_compiler(chunk_input=exported),
+    }
+    operators = {
+        "add": lambda: sample + other, "sub": lambda: sample - other, "mul": lambda: sample * 2,
+        "truediv": lambda: sample / 2, "floordiv": lambda: sample // 2, "mod": lambda: sample % other,
+        "pow": lambda: other ** 1, "eq": lambda: sample == other, "ne": lambda: sample != other,
+        "lt": lambda: sample < other, "le": lambda: sample <= other,
+        "gt": lambda: sample > other, "ge": lambda: sample >= other,
+    }
+    for name, function in operators.items():
+        cases[f"op_{name}"] = function
+    for unit in ("year", "month", "day", "hour", "minute", "second"):
+        cases[f"convert_to_{unit}"] = lambda unit=unit: getattr(sample._convert_to_, unit)
+    return cases
+
+def time_case(function, min_time: float) -> tuple[float, int]:
+    "calls `function` in growing batches until a batch lasts `min_time` seconds, returns (ops/sec, loops)"
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops / elapsed, loops
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+def bytes_per_object(factory, count: int = 10000) -> float:
+    "average memory kept alive per object built by `factory(i)`, measured with tracemalloc"
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return (held - sys.getsizeof([None] * count)) / count
+
+def run(*, min_time: float = 0.2, years = YEARS, eras = ERAS) -> dict:
+    "runs every case for every year / era and returns the JSON ready report"
+    results = []
+    for era in eras:
+        for year in years:
+            for case, function in _cases(year, era).items():
+                ops, loops = time_case(function, min_time)
+                results.append({"case": case, "year": year, "era": era.name, "ops_per_sec": round(ops, 1), "loops": loops})
+
+    base = dat.datetime([2024, 6, 15, 12, 30, 45.5]).rawtime
+    memory = {
+        "operand_lazy": bytes_per_object(lambda i: dat.operand(base + i)),
+        "operand_decomposed": bytes_per_object(lambda i: (lambda item: (item.output, item)[1])(dat.operand(base + i))),
+        "datetime": bytes_per_object(lambda i: dat.datetime([2024, 6, 15, 12, 30, i % 60])),
+    }
+    return {
+        "datcon_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "min_time": min_time,
+        "results": results,
+        "bytes_per_object": {name: round(size, 1) for name, size in memory.items()},
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m datcon.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="shorter timing batches, for smoke runs")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(min_time=0.02 if args.quick else 0.2)
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
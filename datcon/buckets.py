@@ -0,0 +1,97 @@
+from __future__ import annotations
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only DatArray input uses it
+    np = None
+
+from .datcon import dat, _calendar_floor, _calendar_next
+
+__all__ = ["resample", "AGGREGATIONS"]
+
+AGGREGATIONS:tuple[str] = ("count", "sum", "min", "max", "mean")
+
+def resample(dats, values = None, unit: str = "h", agg: str = "count"):
+    """
+    Groups `dats` into calendar buckets of one `unit` ("y", "m", "d", "h", "mi", "s", see dat.floor) and aggregates
+    the matching `values` of every bucket with `agg` ("count", "sum", "min", "max" or "mean"; "count" needs no values).\n
+    a list of dats gives back a list of `(bucket start dat, aggregate)` pairs: the rows are sorted by rawtime if they
+    aren't already and then read in a single pass, the calendar is only asked for the bucket boundaries, once per bucket.\n
+    a DatArray (with values as an array) gives back `(DatArray of bucket starts, ndarray of aggregates)`, computed with
+    numpy reductions. empty buckets are left out in both cases
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"unknown aggregation {agg!r}, use one of {list(AGGREGATIONS)}")
+    if values is None and agg != "count":
+        raise ValueError(f"{agg!r} needs values to aggregate")
+    if unit not in dat.TIME_UNITS:
+        raise ValueError(f"unknown unit {unit!r}, use one of {list(dat.TIME_UNITS)}")
+
+    from .datarray import DatArray
+    if isinstance(dats, DatArray):
+        return _resample_array(dats, values, unit, agg)
+
+    dats = list(dats)
+    if not dats:
+        return []
+    values = [1] * len(dats) if values is None else list(values)
+    if len(values) != len(dats):
+        raise ValueError("dats and values must have the same length")
+    # exact rawtimes (Fractions for TickDat), a tick before a boundary must stay in the bucket before it
+    rows = list(zip([item._exact_rawtime() for item in dats], values))
+    if any(rows[n][0] > rows[n + 1][0] for n in range(len(rows) - 1)):
+        rows.sort(key=itemgetter(0))
+    if rows[0][0] < 0:
+        raise ValueError("calendar buckets are only defined for AC dats")
+
+    cls, drift = type(dats[0]), dats[0].drift
+    step = 0 if unit == "m" else dat.TIME_UNITS[unit]
+    combine = {"sum": float.__add__, "mean": float.__add__, "min": min, "max": max}.get(agg)
+
+    def finish(count: int, total: float | None) -> float | int:
+        return count if agg == "count" else total / count if agg == "mean" else total
+
+    result = []
+    boundary, parts = _calendar_floor(rows[0][0], unit, step)
+    following = _calendar_next(boundary, parts, unit, step)[0]
+    count = 0
+    total = None
+    for raw, value in rows:
+        if raw >= following:
+            result.append((cls.from_parts(boundary, parts, drift), finish(count, total)))
+            boundary, parts = _calendar_floor(raw, unit, step)  # jumps over empty buckets
+            following = _calendar_next(boundary, parts, unit, step)[0]
+            count, total = 0, None
+        count += 1
+        if combine is not None:
+            total = float(value) if total is None else combine(total, float(value))
+    result.append((cls.from_parts(boundary, parts, drift), finish(count, total)))
+    return result
+
+def _resample_array(array, values, unit: str, agg: str):
+    from .datarray import DatArray
+    keys = array.floor(unit).rawtime
+    data = None if values is None else np.asarray(values, dtype=np.float64)
+    if data is not None and data.shape != keys.shape:
+        raise ValueError("dats and values must have the same length")
+    if keys.size and np.any(keys[1:] < keys[:-1]):
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        data = None if data is None else data[order]
+    if not keys.size:
+        return DatArray([], array.drift), np.array([], dtype=np.float64)
+
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, keys.size))
+    if agg == "count":
+        aggregated = counts.astype(np.float64)
+    elif agg == "min":
+        aggregated = np.minimum.reduceat(data, starts)
+    elif agg == "max":
+        aggregated = np.maximum.reduceat(data, starts)
+    else:
+        aggregated = np.add.reduceat(data, starts)
+        if agg == "mean":
+            aggregated = aggregated / counts
+    return DatArray(keys[starts], array.drift), aggregated
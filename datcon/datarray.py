@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the columnar types need it
+    np = None
+
+from .datcon import (dat, Maths_Support, AC, BC, _DAYS_BEFORE_MONTH, _DAYS_BEFORE_MONTH_LEAP, _UNIX_EPOCH,
+                     _DAYS_PER_400_YEARS, _DAYS_PER_FIRST_CENTURY, _DAYS_PER_CENTURY, _DAYS_PER_4_YEARS)
+
+__all__ = ["DatArray", "convert_rawtime_to_date_many", "convert_ticks_to_date_many"]
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("DatArray needs numpy, install it with `pip install numpy` or `pip install datcoM[numpy]`")
+
+def _days_to_ymd_many(days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized twin of datcon._days_to_ymd for non negative int64 day counts,
+    same 400/100/4 year cycle arithmetic with the branches turned into masks
+    """
+    n400, days = np.divmod(days, _DAYS_PER_400_YEARS)
+    Y = n400 * 400
+
+    late = days >= _DAYS_PER_FIRST_CENTURY  # past the first (leap) century of the cycle
+    n100, late_days = np.divmod(days - _DAYS_PER_FIRST_CENTURY, _DAYS_PER_CENTURY)
+    days = np.where(late, late_days, days)
+    Y += np.where(late, 100 + n100 * 100, 0)
+
+    # the first 4 year block of a late century has no leap year (100, 200, 300)
+    skip = late & (days >= _DAYS_PER_4_YEARS - 1)
+    no_leap_block = late & ~skip
+    days = np.where(skip, days - (_DAYS_PER_4_YEARS - 1), days)
+    Y += np.where(skip, 4, 0)
+
+    n4, block_days = np.divmod(days, _DAYS_PER_4_YEARS)
+    after_leap = block_days >= 366
+    n1, year_days = np.divmod(block_days - 366, 365)
+    leap_first_years = n4 * 4 + np.where(after_leap, n1 + 1, 0)
+    leap_first_days = np.where(after_leap, year_days, block_days)
+    n1, year_days = np.divmod(days, 365)
+    Y += np.where(no_leap_block, n1, leap_first_years)
+    days = np.where(no_leap_block, year_days, leap_first_days)
+
+    leap = ((Y % 4 == 0) & (Y % 100 != 0)) | (Y % 400 == 0)
+    table = _DAYS_BEFORE_MONTH_TABLE[leap.astype(np.intp)]
+    M = days // 32 + 1  # never overshoots, at most one step short
+    M += days >= np.take_along_axis(table, M[:, None], axis=1)[:, 0]
+    D = days - np.take_along_axis(table, (M - 1)[:, None], axis=1)[:, 0] + 1
+    return Y, M, D
+
+def _month_start_days_many(Y: np.ndarray, M: np.ndarray) -> np.ndarray:
+    "vectorized datcon._ymd_to_days(Y, M, 1): day count of the first day of every (Y, M)"
+    before_year = np.where(Y > 0, 365 * Y + (Y + 3) // 4 - (Y + 99) // 100 + (Y + 399) // 400, 0)
+    leap = ((Y % 4 == 0) & (Y % 100 != 0)) | (Y % 400 == 0)
+    return before_year + _DAYS_BEFORE_MONTH_TABLE[leap.astype(np.intp), M - 1]
+
+_DAYS_BEFORE_MONTH_TABLE = None if np is None else np.array([_DAYS_BEFORE_MONTH, _DAYS_BEFORE_MONTH_LEAP], dtype=np.int64)
+
+def convert_rawtime_to_date_many(seconds) -> tuple[np.ndarray, ...]:
+    """
+    Vectorized dat.convert_rawtime_to_date: takes an array of non negative seconds and returns
+    the `(Y, M, D, h, mi, s)` columns, ints for everything but the float seconds (rounded to 4 decimals)
+    """
+    _require_numpy()
+    seconds = np.asarray(seconds, dtype=np.float64).ravel()
+    days = np.floor_divide(seconds, 86400).astype(np.int64)
+    rem = np.mod(seconds, 86400)
+    Y, M, D = _days_to_ymd_many(days)
+    h = np.floor_divide(rem, 3600).astype(np.int64)
+    rem = np.mod(rem, 3600)
+    mi = np.floor_divide(rem, 60).astype(np.int64)
+    s = np.round(np.mod(rem, 60), 4)
+    return Y, M, D, h, mi, s
+
+def convert_ticks_to_date_many(ticks, ticks_per_second: int = 1_000_000) -> tuple[np.ndarray, ...]:
+    """
+    Integer twin of convert_rawtime_to_date_many for non negative int64 tick counts (see `TickDat.to_array`),
+    every split is an exact integer division, the float seconds keep the tick resolution
+    """
+    _require_numpy()
+    ticks = np.asarray(ticks, dtype=np.int64).ravel()
+    days, rem = np.divmod(ticks, 86400 * ticks_per_second)
+    Y, M, D = _days_to_ymd_many(days)
+    h, rem = np.divmod(rem, 3600 * ticks_per_second)
+    mi, rem = np.divmod(rem, 60 * ticks_per_second)
+    return Y, M, D, h, mi, rem / ticks_per_second
+
+#-----Datetime64-------
+# datetime64 units read as plain int64 counts, anything else is cast to one of them first
+_DATETIME64_PER_SECOND:dict[str, int] = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+_DATETIME64_COARSE:frozenset = frozenset(("Y", "M", "W", "D", "h", "m"))
+
+def _as_datetime64(values) -> np.ndarray:
+    """
+    `values` as a datetime64 array in one of the _DATETIME64_PER_SECOND units, without a copy when it already is one,
+    lists of datetime objects or ISO strings are converted by numpy
+    """
+    array = np.asarray(values)
+    if array.dtype.kind != "M":
+        array = array.astype("datetime64[us]")
+    unit, count = np.datetime_data(array.dtype)
+    if count != 1 or unit not in _DATETIME64_PER_SECOND:
+        array = array.astype("datetime64[s]" if unit in _DATETIME64_COARSE else "datetime64[ns]")
+    return array
+
+def _tick_unit(ticks_per_second: int) -> tuple[str, int]:
+    "coarsest datetime64 unit holding a tick exactly and how many of its counts make one tick"
+    if 10**9 % ticks_per_second:
+        raise ValueError(f"{ticks_per_second} ticks per second has no datetime64 unit, it has to divide 10**9")
+    unit = min((name for name, per in _DATETIME64_PER_SECOND.items() if per >= ticks_per_second), key=_DATETIME64_PER_SECOND.get)
+    return unit, _DATETIME64_PER_SECOND[unit] // ticks_per_second
+
+def _datetime64_to_ticks(values, ticks_per_second: int) -> np.ndarray:
+    "int64 ticks since 0000-01-01 of a datetime64 array, one cast (skipped when the unit already matches) and one shift"
+    _require_numpy()
+    array = _as_datetime64(values)
+    if np.isnat(array).any():
+        raise ValueError("NaT has no tick count")
+    unit, scale = _tick_unit(ticks_per_second)
+    counts = array.astype(f"datetime64[{unit}]", copy=False).view(np.int64)
+    ticks = counts // scale if scale != 1 else counts.copy()  # the view still belongs to `values`
+    ticks += _UNIX_EPOCH * ticks_per_second
+    if ticks.size and ticks.min() < 0:
+        raise ValueError("datetime64 values before 0000-01-01 have no AC tick count")
+    return ticks
+
+def _ticks_to_datetime64(ticks, ticks_per_second: int) -> np.ndarray:
+    "datetime64 array of int64 tick counts, shifted to the unix epoch in one vectorized step and viewed without another copy"
+    _require_numpy()
+    ticks = np.asarray(ticks, dtype=np.int64)
+    if ticks.size and ticks.min() < 0:
+        raise ValueError("BC dats have no datetime64 value")
+    unit, scale = _tick_unit(ticks_per_second)
+    counts = ticks - _UNIX_EPOCH * ticks_per_second
+    if scale != 1:
+        if counts.size and np.abs(counts).max() > np.iinfo(np.int64).max // scale:
+            raise ValueError(f"dats too far from 1970 for datetime64[{unit}]")
+        counts *= scale
+    return counts.view(f"datetime64[{unit}]")
+
+class DatArray:
+    """Columnar batch of dat values: a float64 NumPy array of `rawtime` seconds plus one shared `drift`. Supports the same operations as Maths_Support (add, subtract, scale, divide, compare) as vectorized ops returning new DatArrays or boolean arrays, and decomposes every rawtime into year/month/day/hour/minute/second columns at once, without building a Python dat per row. Indexing a single row gives back a (lazy) dat with the same drift."""
+    __slots__ = ("rawtime", "drift")
+
+    def __init__(self, rawtime = (), drift: dat | float | int = 0):
+        """Wrap `rawtime` (any array-like of seconds) as a float64 array, `drift` accepts whatever dat.drift_converter accepts."""
+        _require_numpy()
+        self.rawtime:np.ndarray = np.asarray(rawtime, dtype=np.float64)
+        self.drift:float = drift.rawtime if isinstance(drift, dat) else float(drift)
+
+    @classmethod
+    def from_dats(cls, dats, drift: dat | float | int | None = None) -> DatArray:
+        """
+        builds a DatArray from an iterable of dat objects,\n
+        if no drift is given the drift of the first dat is kept
+        """
+        _require_numpy()
+        dats = list(dats)
+        if drift is None:
+            drift = dats[0].drift if dats else 0
+        return cls(np.fromiter((d.rawtime for d in dats), dtype=np.float64, count=len(dats)), drift)
+
+    def to_dats(self) -> list[dat]:
+        "converts every row back into a (lazy) dat object carrying the array drift"
+        compiler = dat.input_compiler
+        drift = self.drift
+        return [compiler(raw, drift=drift, output=None) for raw in self.rawtime.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.rawtime)
+
+    def __iter__(self):
+        return iter(self.to_dats())
+
+    def __getitem__(self, key) -> dat | DatArray:
+        """integer keys return a single dat, slices / masks / index arrays return a DatArray, both keep the drift"""
+        if isinstance(key, (int, np.integer)):
+            return dat.input_compiler(float(self.rawtime[key]), drift=self.drift, output=None)
+        return DatArray(self.rawtime[key], self.drift)
+
+    def __repr__(self) -> str:
+        return f"DatArray({self.rawtime!r}, drift={self.drift})"
+
+    #-----Maths-------
+    @staticmethod
+    def _operand_values(other):
+        """rawtime of dats / DatArrays, plain numbers and arrays as they are, None for unsupported types"""
+        if isinstance(other, (DatArray, Maths_Support)):
+            return other.rawtime
+        if isinstance(other, (int, float, np.number, np.ndarray)):
+            return other
+        return None
+
+    def _maths(self, other, operation, wrap: bool = True):
+        value = self._operand_values(other)
+        if value is None:
+            return NotImplemented
+        result = operation(self.rawtime, value)
+        return DatArray(result, self.drift) if wrap else result
+
+    def __add__(self, other) -> DatArray:
+        return self._maths(other, np.add)
+
+    def __radd__(self, other) -> DatArray:
+        return self._maths(other, np.add)
+
+    def __sub__(self, other) -> DatArray:
+        return self._maths(other, np.subtract)
+
+    def __rsub__(self, other) -> DatArray:
+        return self._maths(other, lambda raw, value: np.subtract(value, raw))
+
+    def __mul__(self, other) -> DatArray:
+        return self._maths(other, np.multiply)
+
+    def __rmul__(self, other) -> DatArray:
+        return self._maths(other, np.multiply)
+
+    def __truediv__(self, other) -> DatArray:
+        return self._maths(other, np.true_divide)
+
+    def __floordiv__(self, other) -> DatArray:
+        return self._maths(other, np.floor_divide)
+
+    def __mod__(self, other) -> np.ndarray:
+        "like Maths_Support.__mod__ it returns plain numeric remainders instead of dats"
+        return self._maths(other, np.mod, wrap=False)
+
+    def __pow__(self, other) -> DatArray:
+        return self._maths(other, np.power)
+
+    def __eq__(self, other) -> np.ndarray:
+        return self._maths(other, np.equal, wrap=False)
+
+    def __ne__(self, other) -> np.ndarray:
+        return self._maths(other, np.not_equal, wrap=False)
+
+    def __gt__(self, other) -> np.ndarray:
+        return self._maths(other, np.greater, wrap=False)
+
+    def __ge__(self, other) -> np.ndarray:
+        return self._maths(other, np.greater_equal, wrap=False)
+
+    def __lt__(self, other) -> np.ndarray:
+        return self._maths(other, np.less, wrap=False)
+
+    def __le__(self, other) -> np.ndarray:
+        return self._maths(other, np.less_equal, wrap=False)
+
+    __hash__ = None  # mutable container with elementwise __eq__
+
+    #-----Calendar-------
+    @property
+    def epoch_type(self) -> np.ndarray:
+        "object array of AC / BC per row, same rule as dat.operand (negative rawtime -> BC)"
+        return np.where(self.rawtime < 0, BC, AC)
+
+    def components(self) -> tuple[np.ndarray, ...]:
+        """
+        `(Y, M, D, h, mi, s)` columns for every row, the vectorized equivalent of calling
+        convert_rawtime_to_date on each dat (BC rows are decomposed by magnitude, like dat.operand)
+        """
+        return convert_rawtime_to_date_many(np.abs(self.rawtime))
+
+    def floor(self, unit: str) -> DatArray:
+        """
+        vectorized dat.floor: start of the `unit` ("y", "m", "d", "h", "mi", "s") bucket of every row,
+        computed from the rawtimes alone (the calendar units only decompose into year / month)
+        """
+        return DatArray(self._bucket_starts(self.rawtime, unit), self.drift)
+
+    def ceil(self, unit: str) -> DatArray:
+        "vectorized dat.ceil, rows already on a boundary are kept"
+        starts = self._bucket_starts(self.rawtime, unit)
+        on_boundary = starts == self.rawtime
+        if unit in ("y", "m"):
+            Y, M = convert_rawtime_to_date_many(starts)[0:2]
+            if unit == "y":
+                Y, M = Y + 1, np.ones_like(M)
+            else:
+                Y, M = Y + M // 12, M % 12 + 1
+            following = _month_start_days_many(Y, M) * 86400.0
+        else:
+            following = starts + dat.TIME_UNITS[unit]
+        return DatArray(np.where(on_boundary, starts, following), self.drift)
+
+    @staticmethod
+    def _bucket_starts(rawtime: np.ndarray, unit: str) -> np.ndarray:
+        if unit not in dat.TIME_UNITS:
+            raise ValueError(f"unknown unit {unit!r}, use one of {list(dat.TIME_UNITS)}")
+        if rawtime.size and rawtime.min() < 0:
+            raise ValueError("calendar buckets are only defined for AC dats")
+        if unit in ("y", "m"):
+            days = np.floor_divide(rawtime, 86400).astype(np.int64)
+            Y, M, _ = _days_to_ymd_many(days)
+            return _month_start_days_many(Y, np.ones_like(M) if unit == "y" else M) * 86400.0
+        step = dat.TIME_UNITS[unit]
+        return np.floor_divide(rawtime, step) * step
+
+    #-----Datetime64-------
+    @classmethod
+    def from_datetime64(cls, values, drift: dat | float | int = 0) -> DatArray:
+        """
+        DatArray of a numpy datetime64 array (a list of datetime objects or ISO strings works too) with one vectorized
+        epoch shift: the int64 counts are read through a view, no per element conversion. the wall clock values are taken
+        as they are plus `drift`, NaT becomes NaN
+        """
+        _require_numpy()
+        array = _as_datetime64(values)
+        per_second = _DATETIME64_PER_SECOND[np.datetime_data(array.dtype)[0]]
+        counts = array.view(np.int64)
+        missing = np.isnat(array)
+        if per_second == 1:
+            rawtime = (counts + _UNIX_EPOCH).astype(np.float64)
+        else:
+            # whole seconds and the remainder apart, so the large count never goes through a float division
+            whole, part = np.divmod(counts, per_second)
+            rawtime = (whole + _UNIX_EPOCH).astype(np.float64)
+            rawtime += part / per_second
+        if missing.any():
+            rawtime[missing] = np.nan
+        present = rawtime[~missing] if missing.any() else rawtime
+        if present.size and present.min() < 0:
+            raise ValueError("datetime64 values before 0000-01-01 have no AC dat")
+        self = cls(rawtime, drift)
+        if self.drift:
+            self.rawtime += self.drift
+        return self
+
+    def to_datetime64(self, unit: str = "us") -> np.ndarray:
+        """
+        datetime64 array in `unit` ("s", "ms", "us" or "ns") of the wall clock time of every row, shifted to the unix
+        epoch in one vectorized step and viewed as datetime64 without another copy, NaN becomes NaT.
+        float rawtimes only hold a few microseconds near the present, use TickDat.to_datetime64 for exact values
+        """
+        if unit not in _DATETIME64_PER_SECOND:
+            raise ValueError(f"unknown datetime64 unit {unit!r}, use one of {list(_DATETIME64_PER_SECOND)}")
+        per_second = _DATETIME64_PER_SECOND[unit]
+        missing = np.isnan(self.rawtime)
+        rawtime = np.where(missing, _UNIX_EPOCH, self.rawtime) if missing.any() else self.rawtime
+        if rawtime.size:
+            if rawtime.min() < 0:
+                raise ValueError("BC dats have no datetime64 value")
+            if max(abs(rawtime.min() - _UNIX_EPOCH), abs(rawtime.max() - _UNIX_EPOCH)) >= np.iinfo(np.int64).max // per_second:
+                raise ValueError(f"dats too far from 1970 for datetime64[{unit}]")
+        whole = np.floor(rawtime)
+        counts = (whole - _UNIX_EPOCH).astype(np.int64)
+        if per_second != 1:
+            counts *= per_second
+            counts += np.rint((rawtime - whole) * per_second).astype(np.int64)
+        if missing.any():
+            counts[missing] = np.iinfo(np.int64).min  # NaT
+        return counts.view(f"datetime64[{unit}]")
+
+    # single column shortcuts, call components() once when several columns are needed
+    @property
+    def year(self) -> np.ndarray:
+        return self.components()[0]
+
+    @property
+    def month(self) -> np.ndarray:
+        return self.components()[1]
+
+    @property
+    def day(self) -> np.ndarray:
+        return self.components()[2]
+
+    @property
+    def hour(self) -> np.ndarray:
+        return self.components()[3]
+
+    @property
+    def minute(self) -> np.ndarray:
+        return self.components()[4]
+
+    @property
+    def second(self) -> np.ndarray:
+        return self.components()[5]
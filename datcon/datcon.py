@@ -1,8 +1,15 @@
 from __future__ import annotations
+from datetime import date, datetime as py_datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 import ast
+import re
+import struct
+import time
+from fractions import Fraction
 
-__all__ = ["dat", "dat_support", "Maths_Support","AC","BC", "EpochType"]
+__all__ = ["dat", "dat_support", "Maths_Support", "Duration", "AC","BC", "EpochType", "dump_many", "load_many",
+           "enable_calendar_cache", "disable_calendar_cache", "clear_calendar_cache", "calendar_cache_info"]
 
 class EpochType(Enum):
     """Enum representing era/epoch for dat objects. Members: AC ('ac') and BC ('bc'). Used to mark whether a dat's rawtime is positive (AC) or negative (BC)."""
@@ -15,112 +22,354 @@ AC = EpochType.AC
 BC = EpochType.BC
 """Alias for EpochType.BC exported for convenient external usage."""
 
+#-----Calendar-Engine-------
+# proleptic gregorian calendar counted from year 0 (a leap year), the same timeline dat has always used
+_DAYS_PER_400_YEARS = 146097
+_DAYS_PER_FIRST_CENTURY = 36525  # years 0..99 of a 400 year cycle, starts with a leap year
+_DAYS_PER_CENTURY = 36524  # the other three centuries, start with a non leap year
+_DAYS_PER_4_YEARS = 1461
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365)
+_DAYS_BEFORE_MONTH_LEAP = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335, 366)
+
+def _is_leap_year(y: int) -> bool:
+    return (y % 4 == 0 and y % 100 != 0) or (y % 400 == 0)
+
+def _days_before_year(Y: int) -> int:
+    """
+    Days from 0000-01-01 up to Y-01-01, in constant time.\n
+    years before 0 count as 0 days, exactly like the old `range(0, Y)` loop did
+    """
+    if Y <= 0:
+        return 0
+    # leap years in [0, Y) -> multiples of 4, minus multiples of 100, plus multiples of 400
+    return 365 * Y + (Y + 3) // 4 - (Y + 99) // 100 + (Y + 399) // 400
+
+def _compute_days_to_ymd(days: int) -> tuple[int, int, int]:
+    """
+    Split a whole day count since 0000-01-01 into (Y, M, D) using the 400/100/4 year cycles.\n
+    negative day counts keep the historic behaviour of the year loop: year 0, january, day `days + 1`
+    """
+    if days < 0:
+        return 0, 1, days + 1
+
+    n400, days = divmod(days, _DAYS_PER_400_YEARS)
+    Y = n400 * 400
+    leap_first = True  # does the current 4 year block start with a leap year
+    if days >= _DAYS_PER_FIRST_CENTURY:
+        n100, days = divmod(days - _DAYS_PER_FIRST_CENTURY, _DAYS_PER_CENTURY)
+        Y += 100 + n100 * 100
+        # first 4 year block of these centuries has no leap year (100, 200, 300)
+        if days >= _DAYS_PER_4_YEARS - 1:
+            days -= _DAYS_PER_4_YEARS - 1
+            Y += 4
+        else:
+            leap_first = False
+    n4, days = divmod(days, _DAYS_PER_4_YEARS)
+    Y += n4 * 4
+    if leap_first:
+        if days >= 366:
+            n1, days = divmod(days - 366, 365)
+            Y += 1 + n1
+    else:
+        n1, days = divmod(days, 365)
+        Y += n1
+
+    table = _DAYS_BEFORE_MONTH_LEAP if _is_leap_year(Y) else _DAYS_BEFORE_MONTH
+    M = days // 32 + 1  # never overshoots, at most one step short
+    if days >= table[M]:
+        M += 1
+    return Y, M, days - table[M - 1] + 1
+
+def _compute_ymd_to_days(Y: int, M: int, D: int) -> int:
+    """
+    Count days from year 0, month 1, day 1 up to Y/M/D (exclusive of the target day), in constant time.
+    """
+    days = _days_before_year(Y)
+    if M > 1:
+        table = _DAYS_BEFORE_MONTH_LEAP if _is_leap_year(Y) else _DAYS_BEFORE_MONTH
+        days += table[min(M, 13) - 1]
+    return days + (D - 1)
+
+def _shift_months(Y: int, M: int, D: int, months: int) -> tuple[int, int, int]:
+    """
+    Moves Y/M/D by a whole number of months, clamping the day to the end of shorter months (jan 31 + 1 -> feb 28/29).
+    """
+    total = (M - 1) + months
+    Y, M = Y + total // 12, total % 12 + 1
+    table = _DAYS_BEFORE_MONTH_LEAP if _is_leap_year(Y) else _DAYS_BEFORE_MONTH
+    return Y, M, min(D, table[M] - table[M - 1])
+
+def _time_parts(seconds: float | int) -> list:
+    "[h, mi, s] of a non negative rawtime, the same split convert_rawtime_to_date does"
+    rem = seconds % 86400
+    return [int(rem // 3600), int(rem % 3600 // 60), float(round(rem % 60, 4))]
+
+def _calendar_floor(seconds, unit: str, step: int) -> tuple[int, list]:
+    """
+    start of the `unit` bucket holding the non negative rawtime `seconds` and its components,\n
+    `step` is the unit's TIME_UNITS length (ignored for the calendar units "m" / "y"). ints, floats or Fractions are accepted
+    """
+    days = int(seconds // 86400)
+    Y, M, D = _days_to_ymd(days)
+    if unit == "y":
+        return _ymd_to_days(Y, 1, 1) * 86400, [Y, 1, 1, 0, 0, 0.0]
+    if unit == "m":
+        return _ymd_to_days(Y, M, 1) * 86400, [Y, M, 1, 0, 0, 0.0]
+    boundary = int(seconds // step) * step
+    rem = boundary - days * 86400
+    return boundary, [Y, M, D, rem // 3600, rem % 3600 // 60, float(rem % 60)]
+
+def _calendar_next(boundary: int, parts: list, unit: str, step: int) -> tuple[int, list]:
+    "bucket following the one `_calendar_floor` returned"
+    if unit == "y" or unit == "m":
+        Y, M, _ = _shift_months(parts[0], parts[1], 1, 12 if unit == "y" else 1)
+        return _ymd_to_days(Y, M, 1) * 86400, [Y, M, 1, 0, 0, 0.0]
+    return _calendar_floor(boundary + step, unit, step)
+
+def _seconds_to_exact_years(seconds: float | int) -> float:
+    """
+    Years elapsed since 0000-01-01 as a float, the fraction measured against the length of the current year.\n
+    constant time twin of dat_support.year's old year by year subtraction (negative input stays inside year 0)
+    """
+    Y = _days_to_ymd(int(seconds // 86400))[0] if seconds >= 0 else 0
+    rest = seconds - _days_before_year(Y) * 86400
+    return Y + rest / ((366 if _is_leap_year(Y) else 365) * 86400)
+
+def _seconds_to_exact_months(seconds: float | int) -> float:
+    """
+    Months elapsed since 0000-01-01 as a float, the fraction measured against the length of the current month.\n
+    constant time twin of dat_support.month's old month by month subtraction (negative input stays inside january of year 0)
+    """
+    if seconds >= 0:
+        Y, M, _ = _days_to_ymd(int(seconds // 86400))
+    else:
+        Y, M = 0, 1
+    table = _DAYS_BEFORE_MONTH_LEAP if _is_leap_year(Y) else _DAYS_BEFORE_MONTH
+    rest = seconds - (_days_before_year(Y) + table[M - 1]) * 86400
+    return Y * 12 + (M - 1) + rest / ((table[M] - table[M - 1]) * 86400)
+
+#-----Calendar-Cache-------
+# every caller goes through these two names, enable_calendar_cache swaps them for lru_cache wrappers,
+# so a disabled cache costs nothing
+_days_to_ymd = _compute_days_to_ymd
+_ymd_to_days = _compute_ymd_to_days
+
+def enable_calendar_cache(maxsize: int | None = 4096) -> None:
+    """
+    Memoize the whole-day parts of the calendar: day number -> [Y, M, D] (convert_rawtime_to_date) and
+    Y/M/D -> day number (convert_input_to_rawtime), keeping up to `maxsize` entries each (None = unbounded).\n
+    only the cheap hour / minute / second split still runs per call. Enabling again resizes and empties the cache
+    """
+    global _days_to_ymd, _ymd_to_days
+    _days_to_ymd = lru_cache(maxsize=maxsize)(_compute_days_to_ymd)
+    _ymd_to_days = lru_cache(maxsize=maxsize)(_compute_ymd_to_days)
+
+def disable_calendar_cache() -> None:
+    "Drops the calendar cache and goes back to computing every conversion."
+    global _days_to_ymd, _ymd_to_days
+    _days_to_ymd = _compute_days_to_ymd
+    _ymd_to_days = _compute_ymd_to_days
+
+def clear_calendar_cache() -> None:
+    "Empties the calendar cache (and its statistics) without disabling it."
+    if _days_to_ymd is not _compute_days_to_ymd:
+        _days_to_ymd.cache_clear()
+        _ymd_to_days.cache_clear()
+
+def calendar_cache_info() -> dict:
+    """
+    Statistics of the calendar cache: `{"enabled": bool, "date": CacheInfo, "days": CacheInfo}`,
+    `date` being the day number -> [Y, M, D] side and `days` the Y/M/D -> day number side (None while disabled)
+    """
+    if _days_to_ymd is _compute_days_to_ymd:
+        return {"enabled": False, "date": None, "days": None}
+    return {"enabled": True, "date": _days_to_ymd.cache_info(), "days": _ymd_to_days.cache_info()}
+
+#-----Instrumentation-Hooks-------
+# loop iteration counters, None unless datcon.instrument is collecting (see enable_instrumentation)
+_loop_counts: dict[str, int] | None = None
+
+def _count_loops(name: str, iterations: int) -> None:
+    _loop_counts[name] = _loop_counts.get(name, 0) + iterations
+
+#-----Clock-------
+_UNIX_EPOCH:int = _days_before_year(1970) * 86400  # rawtime of 1970-01-01, where time.time() counts from
+_OFFSET_PERIOD:int = 900  # utc offsets only ever change on quarter hour boundaries
+_DATETIME_ORIGIN:py_datetime = py_datetime(1, 1, 1)  # datetime.min, rawtime _days_before_year(1) * 86400
+_DATETIME_LOW:int = _days_before_year(1) * 86400
+_DATETIME_HIGH:int = _days_before_year(10000) * 86400  # datetime stops at year 9999
+_local_offset_cache:list = [0, float("-inf")]  # [tm_gmtoff, unix time its quarter hour ends]
+_coarse_clock_cache:list = [None, None]  # [rawtime of the last coarse tick, its components]
+
+def _local_offset(now: float) -> int:
+    "offset of the local time zone at the unix time `now`, asked to the OS once per quarter hour"
+    cache = _local_offset_cache
+    if not cache[1] - _OFFSET_PERIOD <= now < cache[1]:
+        cache[0] = time.localtime(now).tm_gmtoff
+        cache[1] = (now // _OFFSET_PERIOD + 1) * _OFFSET_PERIOD
+    return cache[0]
+
+#-----Parse-Plans-------
+_NUMBER_PATTERN = re.compile(r"[0-9.]+")  # runs of digits / dots, the same numbers the old char by char scan collected
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> tuple[str]:
+    """
+    Turn a string template like `"y-m-d h:mi:s"` into its time units, in TIME_UNITS order.\n
+    longer units are matched and removed first, so the "m" inside "mi" is no longer taken for a month.
+    compiled once per template string and then reused by stamp / parse_many
+    """
+    template = template.lower()
+    found = set()
+    for item in sorted(dat.TIME_UNITS, key=len, reverse=True):
+        if item in template:
+            found.add(item)
+            template = template.replace(item, " ")
+    return tuple(item for item in dat.TIME_UNITS if item in found)
+
+def _key(value: Maths_Support | float | int) -> float:
+    "rawtime of a dat / Duration, plain numbers are taken as rawtimes already"
+    return value.rawtime if isinstance(value, Maths_Support) else value
+
+def _exact_key(value: Maths_Support | float | int) -> float | Fraction:
+    "rawtime as dat's __eq__ / __hash__ see it: a Fraction for TickDat (see dat._exact_rawtime), plain numbers as they are"
+    return value._exact_rawtime() if isinstance(value, dat) else _key(value)
+
 class Maths_Support:
     """Mixin-like utility class that stores a numeric `rawtime` (seconds) and implements arithmetic and comparison dunder methods operating on that rawtime. Designed so dat objects can perform intuitive math (addition, subtraction, scaling, comparisons) based on seconds. It stores `rawtime` as a float and delegates creation of result objects to dat.operand when returning dat instances."""
-    
+    __slots__ = ("rawtime",)
+
     def __init__(self, rawtime:float) -> dat:
         """Initialize a Maths_Support instance with a numeric `rawtime`. Side-effect: stores `self.rawtime` (float)."""
         self.rawtime = rawtime
 
     def __add__(self, other) -> dat:
-        """Add either another Maths_Support (adds their rawtime) or a numeric scalar (seconds). Returns a new dat via dat.operand(sum). Raises TypeError for unsupported types (code currently marks unsupported branches)."""
+        """Add either another Maths_Support (adds their rawtime) or a numeric scalar (seconds). Returns a new dat via dat.operand(sum). Unsupported types return NotImplemented, so Python raises TypeError (or tries the other operand)."""
         if isinstance(other, Maths_Support):
             return dat.operand(self.rawtime + other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime + other)
+        return NotImplemented
 
-    def __sub__(self, other) -> dat:
-        """Subtract another Maths_Support's rawtime or a numeric scalar from this instance's rawtime. Returns a new dat via dat.operand(difference). Unsupported types are intended to raise an error (placeholder in code)."""
+    def __sub__(self, other) -> dat | Duration:
+        """Subtract another Maths_Support's rawtime or a numeric scalar from this instance's rawtime. Returns a new dat via dat.operand(difference), except dat - dat which is a span and returns a Duration. Unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
+            if isinstance(other, dat) and isinstance(self, dat):
+                return Duration(self.rawtime - other.rawtime)
             return dat.operand(self.rawtime - other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime - other)
+        return NotImplemented
 
     def __mul__(self, other) -> dat:
-        """Multiply this instance's rawtime by another Maths_Support.rawtime or a numeric scalar. Returns a new dat via dat.operand(product). Unsupported types are not handled in the code and should result in an error."""
+        """Multiply this instance's rawtime by another Maths_Support.rawtime or a numeric scalar. Returns a new dat via dat.operand(product). Unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
             return dat.operand(self.rawtime * other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime * other)
+        return NotImplemented
 
     def __truediv__(self, other) -> dat:
-        """True-divide this instance's rawtime by another Maths_Support.rawtime or a numeric scalar and return a new dat via dat.operand(quotient). Division by zero and unsupported types are not explicitly handled in the code and should be guarded by callers."""
+        """True-divide this instance's rawtime by another Maths_Support.rawtime or a numeric scalar and return a new dat via dat.operand(quotient). Division by zero is not handled and should be guarded by callers, unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
             return dat.operand(self.rawtime / other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime / other)
+        return NotImplemented
 
     def __floordiv__(self, other) -> dat:
-        """Floor-divide this instance's rawtime by another Maths_Support.rawtime or a numeric scalar, returning a new dat produced by dat.operand(floor_result). Unsupported types are marked in the code with placeholders."""
+        """Floor-divide this instance's rawtime by another Maths_Support.rawtime or a numeric scalar, returning a new dat produced by dat.operand(floor_result). Unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
             return dat.operand(self.rawtime // other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime // other)
+        return NotImplemented
 
     def __mod__(self, other) -> dat:
-        """Return the remainder of dividing this instance's rawtime by another Maths_Support.rawtime or a numeric scalar. Unlike other arithmetic dunders, this method returns a plain numeric remainder (float) rather than a dat object. Unsupported types are left as placeholders."""
+        """Return the remainder of dividing this instance's rawtime by another Maths_Support.rawtime or a numeric scalar. Unlike other arithmetic dunders, this method returns a plain numeric remainder (float) rather than a dat object. Unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
             return self.rawtime % other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime % other
+        return NotImplemented
 
     def __pow__(self, other) -> dat:
-        """Raise this instance's rawtime to the power of another Maths_Support.rawtime or numeric scalar, returning a new dat via dat.operand(result). Unsupported types are marked as TODO in the code."""
+        """Raise this instance's rawtime to the power of another Maths_Support.rawtime or numeric scalar, returning a new dat via dat.operand(result). Unsupported types return NotImplemented."""
         if isinstance(other, Maths_Support):
             return dat.operand(self.rawtime ** other.rawtime)
         elif isinstance(other, (int, float)):
             return dat.operand(self.rawtime ** other)
+        return NotImplemented
 
     def __eq__(self, other) -> dat:
-        """Equality comparison between this instance's rawtime and a Maths_Support.rawtime or numeric scalar; returns a boolean."""
+        """Equality comparison between this instance's rawtime and a Maths_Support.rawtime or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime == other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash of `rawtime`, consistent with __eq__: equal dats (and a dat and the number equal to its rawtime) hash alike. `drift` is already folded into rawtime, so two dats with the same rawtime are the same instant whatever drift they were built with."""
+        return hash(self.rawtime)
 
     def __gt__(self, other) -> dat:
-        """Greater-than comparison against another Maths_Support or numeric scalar; returns a boolean."""
+        """Greater-than comparison against another Maths_Support or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime > other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime > other
+        return NotImplemented
 
     def __ge__(self, other) -> dat:
-        """Greater-than-or-equal comparison against another Maths_Support or numeric scalar; returns a boolean."""
+        """Greater-than-or-equal comparison against another Maths_Support or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime >= other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime >= other
+        return NotImplemented
 
     def __lt__(self, other) -> dat:
-        """Less-than comparison against another Maths_Support or numeric scalar; returns a boolean."""
+        """Less-than comparison against another Maths_Support or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime < other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime < other
+        return NotImplemented
 
     def __le__(self, other) -> dat:
-        """Less-than-or-equal comparison against another Maths_Support or numeric scalar; returns a boolean."""
+        """Less-than-or-equal comparison against another Maths_Support or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime <= other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime <= other
+        return NotImplemented
 
     def __ne__(self, other) -> dat:
-        """Inequality comparison against another Maths_Support or numeric scalar; returns a boolean."""
+        """Inequality comparison against another Maths_Support or numeric scalar; returns a boolean, or NotImplemented for foreign types."""
         if isinstance(other, Maths_Support):
             return self.rawtime != other.rawtime
         elif isinstance(other, (int, float)):
             return self.rawtime != other
+        return NotImplemented
 class dat_support:
-    """Mixin providing high-level property views and conversion helpers for dat instances. Exposes many convenient read-only properties (year, month, day, hour, minute, second, time, date) that behave differently depending on the `converter` mode: 0 -> return raw stored components, 1 -> convert from `rawtime` (seconds) to the requested unit, 2 -> return `dat.datetime` objects constructed from stored components. Also holds `data`, `source` and a `converter` flag which are populated from the dat's `output` during initialization."""
+    """Mixin providing high-level property views and conversion helpers for dat instances. Exposes many convenient read-only properties (year, month, day, hour, minute, second, time, date) that behave differently depending on the `converter` mode: 0 -> return raw stored components, 1 -> convert from `rawtime` (seconds) to the requested unit, 2 -> return `dat.datetime` objects constructed from stored components. Also exposes `data`, `source` and a `converter` flag; `data` and `source` are read from the dat's `output`, so they only trigger the calendar decomposition when actually used."""
+    __slots__ = ()  # `converter` lives in dat's slots, two bases with non empty slots can't be combined
 
     def __init__(self):
-        """Initialize dat_support by reading `self.output` and setting `self.data` (component list) and `self.source` (string describing which view), and set `self.converter` to 0. Expects `self.output` to be populated by dat before calling."""
-        self.data = self.output [0]
-        self.source = self.output[1]
+        """Initialize dat_support by resetting `self.converter` to 0. `data` (component list) and `source` (string describing which view) are read from `self.output` on access, so nothing is decomposed here."""
         self.converter = 0
 
+    @property
+    def data(self) -> list[int | float]:
+        """Component list `[Y, M, D, h, mi, s]`, read from `self.output[0]`."""
+        return self.output[0]
+
+    @property
+    def source(self) -> str:
+        """String describing which view the dat was built as (e.g. 'fulldat'), read from `self.output[1]`."""
+        return self.output[1]
+
     @property
     def _convert_to_(self):
         """Property that sets `self.converter = 1` and returns self. When used before a numeric property it switches the behavior to 'convert from rawtime to unit' mode."""
@@ -148,16 +397,30 @@ class dat_support:
                 seconds -= seconds_in_year(year)
                 year += 1
                 years_passed += 1
+            if _loop_counts is not None:
+                _count_loops("seconds_to_exact_years.year_loop", years_passed)
             fraction_of_year:float | int = seconds / seconds_in_year(year)
             total_years = years_passed + fraction_of_year
             return total_years
         if self.converter == 1:
+            if not self.LEGACY_CALENDAR:
+                return _seconds_to_exact_years(self.rawtime)
             return seconds_to_exact_years(self.rawtime)
         elif self.converter == 2:
             return dat.datetime([self.data[0]])
         return float(self.data[0])
 
-    @property  
+    @staticmethod
+    def convert_to_years_many(dats) -> list[float]:
+        """Batch `_convert_to_.year`: exact years (float) for every dat of the sequence, without touching their converter flag."""
+        return [_seconds_to_exact_years(item.rawtime) for item in dats]
+
+    @staticmethod
+    def convert_to_months_many(dats) -> list[float]:
+        """Batch `_convert_to_.month`: exact months (float) for every dat of the sequence, without touching their converter flag."""
+        return [_seconds_to_exact_months(item.rawtime) for item in dats]
+
+    @property
     def month(self) -> dat | float | int:
         """Property returning the month. converter==1 -> returns months as fractional months derived from `rawtime` (accounts for month lengths and leap years); converter==2 -> returns dat.datetime([1, month]); else returns stored month component as float."""
         def is_leap_year(year):
@@ -183,10 +446,14 @@ class dat_support:
                 if month > 12:
                     month = 1
                     year += 1
+            if _loop_counts is not None:
+                _count_loops("seconds_to_exact_months.month_loop", months_passed)
             fraction_of_month = seconds / seconds_in_month(year, month)
             total_months = months_passed + fraction_of_month
             return total_months 
         if self.converter == 1:
+            if not self.LEGACY_CALENDAR:
+                return _seconds_to_exact_months(self.rawtime)
             return seconds_to_exact_months(self.rawtime)
         elif self.converter == 2:
             return dat.datetime([1,self.data[1]])
@@ -249,6 +516,7 @@ class dat_support:
             return dat.datetime([self.data[0],self.data[1],self.data[2]])
         return self.data[3:6]
 class dat(Maths_Support,dat_support):
+    __slots__ = ("drift", "converter", "min_clock_value", "template", "_output", "epoch_type")
 
     TIME_UNITS:dict[str,int] = {
             "y": 31536000,
@@ -263,17 +531,48 @@ class dat(Maths_Support,dat_support):
         }
     _SENTINEL_VALUE_: object = object()
     CENTRAL_EUROPEAN_TIMELINE:int = int(7200)
+    _STR_LAYOUTS:dict = {  # source -> bound str.format taking (Y, M, D, h, mi, sec, era)
+        "fulldat": "({0:04}-{1:02}-{2:02} {3:02}:{4:02}:{5:02}){6}".format,
+        "date": "({0:04}-{1:02}-{2:02}) {6}".format,
+        "time": "({3:02}:{4:02}:{5:02}) {6}".format,
+        "year": "({0:04}) {6}".format,
+        "month": "({1:02}) {6}".format,
+        "day": "({2:02}) {6}".format,
+        "hour": "({3:02}) {6}".format,
+        "minute": "({4:02}) {6}".format,
+        "second": "({5:02}) {6}".format,
+    }
+    LEGACY_CALENDAR:bool = False  # True -> use the old year by year loops, kept for cross checking the closed form engine
+    DEFAULT_TEMPLATE:tuple[str] = ('y', 'm', 'd', 'h', 'mi', 's')  # shared by every instance, never mutated
+    DEFAULT_MIN_CLOCK_VALUE:tuple[int] = (1, 1, 1)
 
     def __init__(self):
         self.rawtime:float | int = 0
         self.drift:float | int = 0
         self.converter:int = 0
-        self.min_clock_value:int = [1,1,1]  #has to do with whats the year, month, day lowest accepted value
+        self.min_clock_value:tuple[int] = self.DEFAULT_MIN_CLOCK_VALUE  #has to do with whats the year, month, day lowest accepted value
+        self.template:tuple[str] = self.DEFAULT_TEMPLATE
+        self._output:list | None = None  # None -> decomposed lazily from rawtime, see `output`
+        self.epoch_type = AC if self.rawtime >= 0 else BC
+    @property
+    def output(self) -> list:
+        """
+        `[[Y, M, D, h, mi, s], source]` view of the dat.\n
+        dats built from a rawtime (operand and every arithmetic result) only decompose it on first access,
+        so expressions like `a + b - c > d` never touch the calendar code
+        """
+        if self._output is None:
+            self._output = [self.convert_rawtime_to_date(abs(self.rawtime)), "fulldat"]
+        return self._output
 
+    @output.setter
+    def output(self, value: list) -> None:
+        self._output = value
+
+    def components(self) -> list:
+        "`[Y, M, D, h, mi, s]` without storing them on the dat, decomposed again on every call while it is still lazy"
+        return self._output[0] if self._output is not None else self.convert_rawtime_to_date(abs(self.rawtime))
 
-        self.template:str = ['y', 'm', 'd', 'h', 'mi', 's']
-        self.output:list = [None,None]
-        self.epoch_type = AC if self.rawtime >= 0 else BC
     def __str__(self) -> dat :
 
         data, source = self.output
@@ -285,29 +584,19 @@ class dat(Maths_Support,dat_support):
             #RAISE ISSUE
             pass
 
-        # Determine self.epoch_type.name and adjusted values based on calendar mode and rawtime
-
-        # Format string based on source type
-        if source == "fulldat":
-            return f"({Y:04}-{M:02}-{D:02} {h:02}:{mi:02}:{sec:02}){self.epoch_type.name}"
-        elif source == "date":
-            return f"({Y:04}-{M:02}-{D:02}) {self.epoch_type.name}"
-        elif source == "time":
-            return f"({h:02}:{mi:02}:{sec:02}) {self.epoch_type.name}"
-        elif source == "year":
-            return f"({Y:04}) {self.epoch_type.name}"
-        elif source == "month":
-            return f"({M:02}) {self.epoch_type.name}"
-        elif source == "day":
-            return f"({D:02}) {self.epoch_type.name}"
-        elif source == "hour":
-            return f"({h:02}) {self.epoch_type.name}"
-        elif source == "minute":
-            return f"({mi:02}) {self.epoch_type.name}"
-        elif source == "second":
-            return f"({sec:02}) {self.epoch_type.name}"
-        else:
+        # Format string based on source type, layouts are compiled once in _STR_LAYOUTS
+        layout = self._STR_LAYOUTS.get(source)
+        if layout is None:
             return "No source Found"
+        return layout(Y, M, D, h, mi, sec, self.epoch_type.name)
+    
+    def strftime(self, fmt: str) -> str:
+        """
+        formats the dat with a strftime-style pattern (%Y %m %d %H %M %S %f %j %E %s %%),
+        the pattern is compiled once and cached, see `datcon.DatFormat`
+        """
+        from .formatting import compile_format
+        return compile_format(fmt).format(self)
     
     def __int__(self):
         return int(self.rawtime)
@@ -320,12 +609,14 @@ class dat(Maths_Support,dat_support):
         return iter(self.output)
     
     @classmethod
-    def operand(cls, base_rawtime: dat | float | int,*, drift: dat | float | int = 0,reverse: bool = False,min_clock_value = [1,1,1]) :
+    def operand(cls, base_rawtime: dat | float | int,*, drift: dat | float | int | OffsetRule = 0,reverse: bool = False,min_clock_value = DEFAULT_MIN_CLOCK_VALUE) :
         """
-        Treat `base_rawtime` as seconds from the epoch, optionally subtracting drift.
+        Treat `base_rawtime` as seconds from the epoch, optionally subtracting drift
+        (a number, a dat or an `OffsetRule`, looked up at `base_rawtime`).
         If `reverse=True`, flips the sign of `base_rawtime`.
         
-        Returns a new dat object with the correct epoch and rawtime.
+        Returns a new dat object with the correct epoch and rawtime,
+        the `[Y, M, D, h, i, s]` components are only computed when first needed (see `output`).
         """
         self = cls()
         self.min_clock_value = min_clock_value
@@ -333,41 +624,32 @@ class dat(Maths_Support,dat_support):
         if isinstance(base_rawtime, dat):
             base_rawtime = base_rawtime.rawtime
 
-        # 1) Convert drift to a float seconds value
-        drift_sec = self.drift_converter(drift)
-
-        # 2) Apply reverse flag if needed
+        # 1) Apply reverse flag if needed
         if reverse:
             base_rawtime = -base_rawtime
 
+        # 2) Convert drift to a float seconds value, an OffsetRule is resolved at the wall clock reading base_rawtime
+        drift_sec = self.drift_converter(drift, at=base_rawtime, local=True)
+
         # 3) Compute absolute rawtime: seconds since epoch
         absolute_rawtime = base_rawtime - drift_sec
 
-        # 4) Determine epoch type (AC / BC) and magnitude for display
-        if absolute_rawtime < 0:
-            era = BC
-            secs = abs(absolute_rawtime)
-        else:
-            era = AC
-            secs = absolute_rawtime
-
-        # 5) Convert seconds into full [Y, M, D, h, i, s]
-        parts = self.convert_rawtime_to_date(secs)
+        # 4) Determine epoch type (AC / BC), the magnitude is decomposed lazily by `output`
+        era = BC if absolute_rawtime < 0 else AC
 
-        # 6) Fill instance and return
+        # 5) Fill instance and return
         self.rawtime = absolute_rawtime
         self.epoch_type = era
-        self.output = [parts, "fulldat"]   
         self.drift = drift_sec
         dat_support.__init__(self) #always forget that operand thoesnt run on finalize_full_dat lol
 
         return self
     @classmethod
-    def stamp(cls, input_value: list[int] | str = [0,1,1,0,0,0],input_template: list[str] | str = ['y', 'm', 'd', 'h', 'mi', 's'], epoch_type: EpochType = AC,*, drift: dat | float | int = 0,min_clock_value = [1,1,1]) :
+    def stamp(cls, input_value: list[int] | str = [0,1,1,0,0,0],input_template: list[str] | str = DEFAULT_TEMPLATE, epoch_type: EpochType = AC,*, drift: dat | float | int | OffsetRule = 0,min_clock_value = DEFAULT_MIN_CLOCK_VALUE) :
         self = cls() # creates an instance
         self.min_clock_value = min_clock_value
-        self.drift = self.drift_converter(drift)
         value, self.template = self.value_template_extractor(input_value,input_template)
+        self.drift = self.resolve_drift(drift, value, epoch_type)
         if len(value)>6 or len(self.template)>6:
             #RAISE ISSUE    
             pass
@@ -376,7 +658,53 @@ class dat(Maths_Support,dat_support):
             pass
         return self.finalize_full_dat(value,epoch_type)
     @classmethod
-    def datetime(cls, input_value: dat | list[int] | str = [0,1,1,0,0,0], epoch_type: EpochType = AC,*, drift: dat | float | int = 0,template_reverse = False,min_clock_value = [1,1,1]):
+    def parse_many(cls, strings, input_template: list[str] | str, epoch_type: EpochType = AC,*, drift: dat | float | int | OffsetRule = 0,min_clock_value = DEFAULT_MIN_CLOCK_VALUE, as_array: bool = False) -> list[dat]:
+        """
+        bulk version of `dat.stamp` for an iterable of strings sharing one template,\n
+        the template is compiled once into a parse plan and every string then goes through a tight loop,\n
+        returns a list of dat objects, or a columnar `DatArray` of rawtimes if `as_array=True` (needs numpy),
+
+        an `OffsetRule` drift is resolved for every string with a single batch lookup
+        """
+        template = _compile_template(input_template) if isinstance(input_template, str) else tuple(input_template)
+        findall = _NUMBER_PATTERN.findall
+
+        rule = drift if isinstance(drift, OffsetRule) else None
+
+        # one scratch instance carries the shared settings for the rawtime only path
+        scratch = cls()
+        scratch.min_clock_value = min_clock_value
+        scratch.drift = 0.0 if rule is not None else scratch.drift_converter(drift)
+        scratch.template = template
+        to_rawtime = scratch.values_to_rawtime
+
+        rows = [[float(n) for n in findall(string)] for string in strings]
+        drifts = rawtimes = None
+        if rule is not None:
+            # every row is read without drift once (a UTC reading), then all the offsets are resolved in one batch lookup
+            rawtimes = [to_rawtime(row, epoch_type) for row in rows]
+            drifts = rule.offsets(rawtimes)
+
+        if as_array:
+            from .datarray import DatArray
+            if rawtimes is None:
+                rawtimes = [to_rawtime(row, epoch_type) for row in rows]
+            if drifts is not None:
+                sign = -1 if epoch_type == BC else 1
+                rawtimes = [raw + sign * offset for raw, offset in zip(rawtimes, drifts)]
+            return DatArray(rawtimes, scratch.drift)
+
+        parsed = []
+        append = parsed.append
+        for n, row in enumerate(rows):
+            self = cls()
+            self.min_clock_value = min_clock_value
+            self.drift = scratch.drift if drifts is None else drifts[n]
+            self.template = template
+            append(self.finalize_full_dat(row, epoch_type))
+        return parsed
+    @classmethod
+    def datetime(cls, input_value: dat | list[int] | str = [0,1,1,0,0,0], epoch_type: EpochType = AC,*, drift: dat | float | int | OffsetRule = 0,template_reverse = False,min_clock_value = DEFAULT_MIN_CLOCK_VALUE):
         """
         creates a dat object ussing the inputted values while autofilling in case of a lack of does,\n
         by default it follows the `[year,month,day,hour,minute,second]` sequence,\n
@@ -384,28 +712,240 @@ class dat(Maths_Support,dat_support):
         """
         self = cls() # creates an instance
 
-        template = ['y', 'm', 'd', 'h', 'mi', 's'][::-1] if template_reverse else ['y', 'm', 'd', 'h', 'mi', 's']
+        template = self.DEFAULT_TEMPLATE[::-1] if template_reverse else self.DEFAULT_TEMPLATE
         self.min_clock_value = min_clock_value
-        self.drift = self.drift_converter(drift)
         value, self.template = self.value_template_extractor(input_value,template)
+        self.drift = self.resolve_drift(drift, value, epoch_type)
 
         if len(value)>6 or len(value) < 6:
             #RAISE ISSUE    
             pass
         return self.finalize_full_dat(value,epoch_type)
     @classmethod
-    def current_time(cls,*, drift: float | int = 0) -> dat:
+    def current_time(cls,*, drift: float | int | OffsetRule = 0, coarse: bool = False) -> dat:
+        """
+        Returns the current local time as [Y, m, d, h, i, s] (whole seconds),\n
+        adds the drift, `dat or an OffsetRule may be passed as an drift`.\n
+        rawtime comes straight from `time.time()` plus the cached local offset, nothing is normalized or decomposed,
+        with `coarse=True` the components are also computed once per second and shared by every dat of that second
+        """
+        now = time.time()
+        utc = int(now) + _UNIX_EPOCH
+        local = utc + _local_offset(now)
+        self = cls()
+        self.drift = self.drift_converter(drift, at=utc)
+        self.rawtime = rawtime = local + self.drift
+        self.epoch_type = BC if rawtime < 0 else AC
+        if coarse:
+            cache = _coarse_clock_cache
+            if cache[0] != rawtime:
+                cache[0], cache[1] = rawtime, self.convert_rawtime_to_date(abs(rawtime))
+            self.output = [cache[1][:], "fulldat"]
+        return self
+    @classmethod
+    def from_datetime(cls, value: py_datetime | date, *, drift: dat | float | int | OffsetRule = 0) -> dat:
         """
-        Returns the current real-world UTC time as [Y, m, d, h, i, s],\n
-        adds the drift, `dat may be passed as an drift`
+        builds a (lazy) dat from a `datetime.datetime` or `datetime.date` straight from its ordinal, nothing is normalized,\n
+        the wall clock fields are taken as they are, the tzinfo of an aware datetime is not applied (pass the offset as `drift`),
+        microseconds are kept to the resolution of the class, TickDat keeps them exactly
         """
-        import time
-        raw = time.localtime()  # returns struct_time in UTC
-        now = [raw.tm_year, raw.tm_mon, raw.tm_mday, raw.tm_hour, raw.tm_min, raw.tm_sec]
-        return dat.datetime(now,AC, drift = drift)
+        seconds = (value.toordinal() + 365) * 86400  # ordinal 1 is 0001-01-01, 366 days after 0000-01-01
+        microseconds = 0
+        if isinstance(value, py_datetime):
+            seconds += value.hour * 3600 + value.minute * 60 + value.second
+            microseconds = value.microsecond
+        self = cls()
+        self.drift = self.drift_converter(drift, at=seconds)
+        self._set_rawtime(seconds + self.drift if self.drift else seconds, microseconds)
+        self.epoch_type = AC
+        self.output = None
+        dat_support.__init__(self)
+        return self
+    def to_datetime(self, tzinfo = None) -> py_datetime:
+        """
+        naive `datetime.datetime` of the same wall clock time (or aware with `tzinfo` attached), built from the rawtime
+        with one timedelta instead of reading the components, seconds are rounded to the microsecond.\n
+        only years 1-9999 fit in a datetime, anything else (BC and year 0 included) raises ValueError
+        """
+        exact = self._exact_rawtime()
+        if not _DATETIME_LOW <= exact < _DATETIME_HIGH:
+            raise ValueError(f"{self} is outside the years 1-9999 a datetime can hold")
+        whole = int(exact)
+        days, seconds = divmod(whole, 86400)
+        moment = _DATETIME_ORIGIN + timedelta(days=days - 366, seconds=seconds, microseconds=round((exact - whole) * 1_000_000))
+        return moment if tzinfo is None else moment.replace(tzinfo=tzinfo)
+    @classmethod
+    def range(cls, start: dat, stop: dat | None = None, step: int | float = 1, unit: str = "d"):
+        """
+        lazily yields dat values from `start` up to (not including) `stop`, `step` `unit`s apart,\n
+        `unit` is one of the TIME_UNITS keys: "d", "h", "mi" and "s" are fixed steps, "m" and "y" are calendar
+        steps that keep the day of month of `start` and clamp it to the end of shorter months (jan 31 -> feb 29 -> mar 31),\n
+        a negative step walks backwards, `stop=None` never ends.
+        every value comes with its components already filled in, carried over from the previous one instead of
+        being normalized again, the calendar is only consulted when a day boundary is crossed
+        """
+        if unit not in cls.TIME_UNITS:
+            raise ValueError(f"unknown unit {unit!r}, expected one of {list(cls.TIME_UNITS)}")
+        if not step:
+            raise ValueError("step can't be 0")
+        limit = None if stop is None else (stop.rawtime if isinstance(stop, Maths_Support) else stop)
+
+        def reached(raw):
+            return limit is not None and (raw >= limit if step > 0 else raw <= limit)
+
+        build = cls.from_parts
+        drift = start.drift
+
+        if unit in ("m", "y"):
+            if start.rawtime < 0:
+                raise ValueError("calendar steps are only defined for AC dats")
+            Y, M, D = start.data[0:3]
+            day_seconds = start.rawtime - _ymd_to_days(Y, M, D) * 86400  # time of day, kept as is
+            months_step = step * 12 if unit == "y" else step
+            if months_step % 1:
+                raise ValueError("calendar steps must be whole months / years")
+            months_step = int(months_step)
+            k = 0
+            while True:
+                year, month, day = _shift_months(Y, M, D, k * months_step)
+                raw = _ymd_to_days(year, month, day) * 86400 + day_seconds
+                if reached(raw):
+                    return
+                yield build(raw, [year, month, day, *_time_parts(raw)], drift)
+                k += 1
+
+        delta = step * cls.TIME_UNITS[unit]
+        base = start.rawtime
+        current_day = None
+        k = 0
+        while True:
+            raw = base + k * delta
+            if reached(raw):
+                return
+            magnitude = abs(raw)
+            days = int(magnitude // 86400)
+            if days != current_day:  # only crossing a day boundary touches the calendar
+                current_day = days
+                ymd = _days_to_ymd(days)
+            yield build(raw, [*ymd, *_time_parts(magnitude)], drift)
+            k += 1
+    def add_months(self, months: int) -> dat:
+        """
+        returns a new dat `months` calendar months later (earlier if negative), same day of month and time of day,
+        clamped to the end of shorter months (jan 31 + 1 month -> feb 28/29).\n
+        the date components are shifted directly and rawtime moves by the day difference, nothing is normalized again
+        """
+        if months % 1:
+            raise ValueError("add_months needs a whole number of months")
+        return self._shift_calendar(int(months))
+    def add_years(self, years: int) -> dat:
+        "same as `add_months(years * 12)`, so feb 29 + 1 year -> feb 28"
+        if years % 1:
+            raise ValueError("add_years needs a whole number of years")
+        return self._shift_calendar(int(years) * 12)
+    def add_days(self, days: int) -> dat:
+        "returns a new dat `days` calendar days later (earlier if negative), same time of day"
+        if days % 1:
+            raise ValueError("add_days needs a whole number of days")
+        if self.rawtime < 0:
+            raise ValueError("calendar arithmetic is only defined for AC dats")
+        Y, M, D = self.data[0:3]
+        old_days = _ymd_to_days(Y, M, D)
+        new_days = old_days + int(days)
+        if new_days < 0:
+            raise ValueError("add_days would move the dat before year 0")
+        return self._moved_by_days(new_days - old_days, _days_to_ymd(new_days))
+    def _shift_calendar(self, months: int) -> dat:
+        if self.rawtime < 0:
+            raise ValueError("calendar arithmetic is only defined for AC dats")
+        Y, M, D = self.data[0:3]
+        year, month, day = _shift_months(Y, M, D, months)
+        if year < 0:
+            raise ValueError("calendar arithmetic would move the dat before year 0")
+        return self._moved_by_days(_ymd_to_days(year, month, day) - _ymd_to_days(Y, M, D), (year, month, day))
+    def advance(self, seconds: dat | float | int) -> dat:
+        """
+        moves this dat `seconds` later (earlier if negative) in place and returns it, the `+=` / `-=` of dats.\n
+        already computed components are carried over: the time of day is split again from the new rawtime and
+        the calendar is only asked for the date when a day boundary is crossed, a lazy dat just stays lazy.\n
+        dats are hashed by rawtime, don't advance one that is used as a dict key / set member
+        """
+        if isinstance(seconds, Maths_Support):
+            seconds = seconds.rawtime
+        old = self.rawtime
+        self.rawtime = new = old + seconds
+        self.epoch_type = BC if new < 0 else AC
+        output = self._output
+        if output is None:
+            return self
+        if old < 0 or new < 0:
+            self._output = None  # decomposed again (by magnitude) when needed
+            return self
+        days, rem = divmod(new, 86400)
+        h, rem = divmod(rem, 3600)
+        mi, sec = divmod(rem, 60)
+        if days == old // 86400:
+            Y, M, D = output[0][0:3]
+        else:
+            Y, M, D = _days_to_ymd(int(days))
+        self._output = [[Y, M, D, int(h), int(mi), float(round(sec, 4))], output[1]]
+        return self
+    def __iadd__(self, other) -> dat:
+        if not isinstance(other, (Maths_Support, int, float)):
+            return NotImplemented
+        return self.advance(other)
+    def __isub__(self, other) -> dat:
+        if isinstance(other, Maths_Support):
+            other = other.rawtime
+        elif not isinstance(other, (int, float)):
+            return NotImplemented
+        return self.advance(-other)
+    def _moved_by_days(self, days: int, ymd: tuple[int, int, int]) -> dat:
+        "copy of the dat `days` whole days later, `ymd` being its already known date"
+        rawtime = self.rawtime + days * 86400
+        return self.from_parts(rawtime, [*ymd, *_time_parts(rawtime)], self.drift)
+    def floor(self, unit: str) -> dat:
+        """
+        start of the `unit` ("y", "m", "d", "h", "mi", "s") this dat falls in, as a new dat with the same drift,\n
+        months and years start on their real calendar boundaries, the other units are multiples of their TIME_UNITS length
+        """
+        boundary, parts = _calendar_floor(self._exact_rawtime(), unit, self._unit_step(unit))
+        return self.from_parts(boundary, parts, self.drift)
+    def ceil(self, unit: str) -> dat:
+        "first `unit` boundary at or after this dat (the dat itself, as a new object, when it already is one), see `floor`"
+        seconds = self._exact_rawtime()
+        step = self._unit_step(unit)
+        boundary, parts = _calendar_floor(seconds, unit, step)
+        if boundary != seconds:
+            boundary, parts = _calendar_next(boundary, parts, unit, step)
+        return self.from_parts(boundary, parts, self.drift)
+    def _unit_step(self, unit: str) -> int:
+        if unit not in self.TIME_UNITS:
+            raise ValueError(f"unknown unit {unit!r}, use one of {list(self.TIME_UNITS)}")
+        if self.rawtime < 0:
+            raise ValueError("calendar buckets are only defined for AC dats")
+        return 0 if unit == "m" else self.TIME_UNITS[unit]
+    def _exact_rawtime(self) -> float | int:
+        "rawtime as the most exact number available, TickDat gives a Fraction"
+        return self.rawtime
+    def _set_rawtime(self, seconds: float | int, microseconds: int) -> None:
+        "stores `seconds` plus a whole number of `microseconds` as rawtime, TickDat adds them without going through a float"
+        self.rawtime = seconds + microseconds / 1_000_000 if microseconds else seconds
+    @classmethod
+    def from_parts(cls, rawtime: float | int, parts: list, drift: float | int = 0) -> dat:
+        """
+        builds a dat from a rawtime and its already known `[Y, M, D, h, mi, s]` components, nothing is recomputed,\n
+        the caller is responsible for `parts` matching `rawtime`
+        """
+        self = cls()
+        self.rawtime = rawtime
+        self.drift = drift
+        self.epoch_type = BC if rawtime < 0 else AC
+        self.output = [parts, "fulldat"]
+        return self
     #-----Support-Methods-------
     @classmethod
-    def input_compiler(cls,rawtime:float | int = 0,template:tuple[str] = ('y', 'm', 'd', 'h', 'mi', 's'),drift:float | int = 0,output:list[list[int | bool | str]]= [None,None],*,chunk_input:str = _SENTINEL_VALUE_,min_clock_value = [1,1,1]):
+    def input_compiler(cls,rawtime:float | int = 0,template:tuple[str] = DEFAULT_TEMPLATE,drift:float | int = 0,output:list[list[int | bool | str]]= [None,None],*,chunk_input:str = _SENTINEL_VALUE_,min_clock_value = DEFAULT_MIN_CLOCK_VALUE):
         """
         providing uncorrect data might result in unexpected behaviour
         """
@@ -441,31 +981,52 @@ class dat(Maths_Support,dat_support):
     def export_compiler(self) -> str:
         "converts the important attributes of the dat object into a string, in such a format that input_compiler will understand it"
         return f"({self.rawtime} | {self.drift} | {self.output[0]} | {self.epoch_type})"
+    def to_bytes(self) -> bytes:
+        """
+        fixed width binary form of the dat: little endian float64 rawtime followed by float64 drift (16 bytes),\n
+        the components and the era are rebuilt from rawtime, so they are not stored
+        """
+        return _RECORD.pack(self.rawtime, self.drift)
+    @classmethod
+    def from_bytes(cls, data: bytes) -> dat:
+        "reverse of `to_bytes`, the returned dat decomposes its rawtime lazily"
+        rawtime, drift = _RECORD.unpack(data)
+        return cls.input_compiler(rawtime, drift=drift, output=None)
     def finalize_full_dat(self, value:list[int], epoch_type: str = AC, output_type="fulldat",) -> dat :
         """
         standart method meant to convert a list of values into a dat object, considering their pre-set parameters
         """
-        template_value_diccionary = {'y':0, 'm':1, 'd':1, 'h':0, 'mi':0, 's':0}
-        for i in range(len(self.template)):
-            for key in template_value_diccionary:
-                if self.template[i] == key:
-                    try:
-                        template_value_diccionary[key] = value[i]
-                        break
-                    except IndexError:
-                        break
-
-        template_value_diccionary = self.normalize_full(template_value_diccionary)
-        total_raw = self.convert_input_to_rawtime(template_value_diccionary)
-        if epoch_type == BC:
-            total_raw = -total_raw
-
+        total_raw = self.values_to_rawtime(value, epoch_type)
         self.rawtime = total_raw
-    
-        parts = self.convert_rawtime_to_date(total_raw)
-        self.output = [parts, output_type]
+
+        if total_raw >= 0 and output_type == "fulldat":
+            self.output = None  # same result as the eager decomposition, computed on first access
+        else:
+            parts = self.convert_rawtime_to_date(total_raw)
+            self.output = [parts, output_type]
         dat_support.__init__(self)
         return self   
+    def values_to_rawtime(self, value:list[int], epoch_type: str = AC) -> float:
+        """
+        maps `value` onto `self.template`, normalizes it and returns the resulting rawtime (negative for BC),
+        without touching the instance
+        """
+        template_value_diccionary = {'y':0, 'm':1, 'd':1, 'h':0, 'mi':0, 's':0}
+        for key, item in zip(self.template, value):
+            if key in template_value_diccionary:
+                template_value_diccionary[key] = item
+
+        vals = template_value_diccionary
+        Y, M, D, h, i, s = vals['y'], vals['m'], vals['d'], vals['h'], vals['mi'], vals['s']
+        if not self.LEGACY_CALENDAR and self.is_normalized(Y, M, D, h, i, s):
+            # already normalized input (the usual parsed timestamp) gives the same rawtime without normalize_full
+            total_raw = float(_ymd_to_days(int(Y), int(M), int(D)) * 86400 + int(h) * 3600 + int(i) * 60 + round(float(s),4)) + self.drift
+        else:
+            template_value_diccionary = self.normalize_full(template_value_diccionary)
+            total_raw = self.convert_input_to_rawtime(template_value_diccionary)
+        if epoch_type == BC:
+            total_raw = -total_raw
+        return total_raw
     def value_template_extractor(self, value: str | list[float | int], template: str) -> list[int] | list[str]:
         """
         if the value or the template are normal strings, it converts them into lists while trying to find their values
@@ -478,22 +1039,7 @@ class dat(Maths_Support,dat_support):
 
         # detect value if str
         if isinstance(value, str):
-            NUMS = set("0123456789.")
-            one_number: str = ""
-            several_numbers: list[float] = []
-
-            for val in value:
-                if val in NUMS:
-                    one_number += val
-                else:
-                    if one_number.strip():
-                        several_numbers.append(float(one_number))
-                    one_number = ""
-
-            if one_number and all(nm in NUMS for nm in one_number):
-                several_numbers.append(float(one_number))
-
-            value: list[float] = several_numbers
+            value: list[float] = [float(number) for number in _NUMBER_PATTERN.findall(value)]
 
         # detect value if list[float | int]
         elif not all(isinstance(item, (float, int)) for item in value):
@@ -502,13 +1048,7 @@ class dat(Maths_Support,dat_support):
 
         # detect template if str
         if isinstance(template, str):
-            template = template.lower()
-            tmp = []
-            for item in self.TIME_UNITS:
-                if item in template:
-                    tmp.append(item)
-                    template.replace(item, "")
-            template = tmp
+            template = list(_compile_template(template))
 
         # detect template if list[str]
         elif not all(isinstance(item, str) for item in template):
@@ -520,6 +1060,21 @@ class dat(Maths_Support,dat_support):
             pass
 
         return [value, template]
+    def is_normalized(self, Y: float, M: float, D: float, h: float, i: float, s: float) -> bool:
+        """
+        True when the fields are whole numbers (but s) inside their ranges and above `min_clock_value`,
+        meaning normalize_full would hand them back unchanged
+        """
+        if not (Y % 1 == 0 and M % 1 == 0 and D % 1 == 0 and h % 1 == 0 and i % 1 == 0):
+            return False
+        if not (1 <= M <= 12 and 0 <= h < 24 and 0 <= i < 60 and 0 <= s < 60):
+            return False
+        min_clock_value = self.min_clock_value
+        if Y < min_clock_value[0] or M < min_clock_value[1] or D < min_clock_value[2] or D < 1:
+            return False
+        table = _DAYS_BEFORE_MONTH_LEAP if _is_leap_year(int(Y)) else _DAYS_BEFORE_MONTH
+        M = int(M)
+        return D <= table[M] - table[M - 1]
     def convert_input_to_rawtime(self, template_value_diccionary: dict[str, float]) -> float:
         """
         Convert Y/m/d h:i:s into raw seconds and add drift. Uses exact calendar days (handles leap years)
@@ -535,6 +1090,9 @@ class dat(Maths_Support,dat_support):
             Count days from year 0, month 1, day 1 up to Y/M/D (exclusive of the target day).
             Uses real month lengths and leap years. Returns an integer number of days.
             """
+            if not self.LEGACY_CALENDAR:
+                return _ymd_to_days(Y, M, D)
+
             mdays = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
             days = 0
 
@@ -549,6 +1107,10 @@ class dat(Maths_Support,dat_support):
                 else:
                     days += mdays[m - 1]
 
+            if _loop_counts is not None:
+                _count_loops("days_since_epoch.year_loop", max(Y, 0))
+                _count_loops("days_since_epoch.month_loop", max(M - 1, 0))
+
             # days in current month: D is 1-based, so D-1 full days have passed
             return days + (D - 1)
 
@@ -566,17 +1128,31 @@ class dat(Maths_Support,dat_support):
         total = total_days * 86400 + h * 3600 + i * 60 + round(s,4)
 
         return float(total) + self.drift
-    def drift_converter(self, drift: dat | float | int) -> float:
+    def drift_converter(self, drift: dat | float | int | OffsetRule, at: float | int = 0, *, local: bool = False) -> float:
         """
-        converts drifts into floats for more homogenous handling across methods
+        converts drifts into floats for more homogenous handling across methods,
+
+        an `OffsetRule` is resolved to the offset in force at the rawtime `at`: a UTC reading the drift is added to
+        (stamp, datetime, parse_many, from_datetime), or with `local=True` a wall clock reading it is subtracted from (operand)
         """
         if isinstance(drift, (float, int)):
             return float(drift)
         elif isinstance(drift, dat):
             return drift.rawtime
+        if isinstance(drift, OffsetRule):
+            return drift.offset_at_local(at) if local else drift.offset_at(at)
         else:
             # RAISE ISSUE
             pass
+    def resolve_drift(self, drift: dat | float | int | OffsetRule, value: list[int], epoch_type: EpochType = AC) -> float:
+        """
+        drift_converter for a dat about to be built from `value`, offset rules are looked up
+        at the rawtime `value` gives without any drift, read on the UTC timeline since the drift is added to it
+        """
+        if isinstance(drift, (float, int, dat)):
+            return self.drift_converter(drift)
+        self.drift = 0
+        return self.drift_converter(drift, at=self.values_to_rawtime(value, epoch_type))
     def normalize_full(self, full: dict[str, float]) -> dict[str, float]:
         """
         Robust normalization that:
@@ -648,7 +1224,9 @@ class dat(Maths_Support,dat_support):
         day = D_whole
 
         # normalize day
+        day_loop = 0  # iterations of both day normalization loops, reported to the instrumentation
         while True:
+            day_loop += 1
             dim = days_in_month(Y, M)
             if day < 1:
                 M -= 1
@@ -684,6 +1262,7 @@ class dat(Maths_Support,dat_support):
 
         # final day normalization
         while True:
+            day_loop += 1
             dim = days_in_month(Y, M)
             if day < 1:
                 M -= 1
@@ -699,6 +1278,8 @@ class dat(Maths_Support,dat_support):
                     Y += 1
             else:
                 break
+        if _loop_counts is not None:
+            _count_loops("normalize_full.day_loop", day_loop)
 
         return {
             "y": int(Y if Y >= self.min_clock_value[0] else 1),
@@ -712,6 +1293,23 @@ class dat(Maths_Support,dat_support):
         """
         Convert rawtime into [Y, m, d, h, i, s], accounting for drift.
         """
+        if self.LEGACY_CALENDAR:
+            return self.convert_rawtime_to_date_legacy(seconds)
+
+        days = int(seconds // 86400)
+        rem = seconds % 86400
+        Y, M, D = _days_to_ymd(days)
+        h = int(rem // 3600)
+        rem %= 3600
+        i = int(rem // 60)
+        s = rem % 60
+
+        return [Y, M, D, h, i, float(round(s,4))]
+    def convert_rawtime_to_date_legacy(self, seconds: float | int) -> list:
+        """
+        Original year by year implementation of convert_rawtime_to_date, linear in the year number.\n
+        kept only to cross check the closed form engine, see `LEGACY_CALENDAR`
+        """
 
         def is_leap_year(y):
             return (y % 4 == 0 and y % 100 != 0) or (y % 400 == 0)
@@ -738,6 +1336,10 @@ class dat(Maths_Support,dat_support):
             else:
                 break
 
+        if _loop_counts is not None:
+            _count_loops("convert_rawtime_to_date.year_loop", Y)
+            _count_loops("convert_rawtime_to_date.month_loop", M - 1)
+
         D = days + 1
         h = int(rem // 3600)
         rem %= 3600
@@ -746,3 +1348,157 @@ class dat(Maths_Support,dat_support):
 
         return [Y, M, D, h, i, float(round(s,4))]
 
+class Duration(Maths_Support):
+    """Span of time in seconds, what `dat - dat` returns. It only holds `rawtime` (the seconds), so building one never touches the calendar: no output list, no era, no decomposition. Supports the same operators as Maths_Support; `dat + Duration` / `dat - Duration` give a dat, while every other combination with numbers or Durations gives a Duration (`%` still returns plain seconds). Like a dat read through `_convert_to_`, `year`, `month`, `day`, `hour`, `minute` and `second` return the span in that unit."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"Duration({self.rawtime})"
+
+    def __str__(self) -> str:
+        "(-1d 02:03:04.5) style, days plus time of day"
+        seconds = abs(self.rawtime)
+        days, rem = divmod(seconds, 86400)
+        h, rem = divmod(rem, 3600)
+        mi, sec = divmod(rem, 60)
+        sec = round(sec, 4)
+        sec = int(sec) if float(sec).is_integer() else sec
+        sign = "-" if self.rawtime < 0 else ""
+        return f"({sign}{int(days)}d {int(h):02}:{int(mi):02}:{sec:02})"
+
+    def __float__(self) -> float:
+        return float(self.rawtime)
+
+    def __int__(self) -> int:
+        return int(self.rawtime)
+
+    def __bool__(self) -> bool:
+        return self.rawtime != 0
+
+    def __neg__(self) -> Duration:
+        return Duration(-self.rawtime)
+
+    def __abs__(self) -> Duration:
+        return Duration(abs(self.rawtime))
+
+    #-----Maths-------
+    def __add__(self, other) -> Duration | dat:
+        if isinstance(other, dat):
+            return dat.operand(self.rawtime + other.rawtime)
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime + other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime + other)
+        return NotImplemented
+
+    def __sub__(self, other) -> Duration | dat:
+        if isinstance(other, dat):
+            return dat.operand(self.rawtime - other.rawtime)
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime - other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime - other)
+        return NotImplemented
+
+    def __mul__(self, other) -> Duration:
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime * other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime * other)
+        return NotImplemented
+
+    def __truediv__(self, other) -> Duration:
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime / other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime / other)
+        return NotImplemented
+
+    def __floordiv__(self, other) -> Duration:
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime // other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime // other)
+        return NotImplemented
+
+    def __pow__(self, other) -> Duration:
+        if isinstance(other, Maths_Support):
+            return Duration(self.rawtime ** other.rawtime)
+        if isinstance(other, (int, float)):
+            return Duration(self.rawtime ** other)
+        return NotImplemented
+
+    #-----Units-------
+    @property
+    def _convert_to_(self) -> Duration:
+        "kept so code written for `(end - start)._convert_to_.day` keeps working, a Duration is always in that mode"
+        return self
+
+    @property
+    def year(self) -> float:
+        "exact years, same count as `dat._convert_to_.year`"
+        return _seconds_to_exact_years(self.rawtime)
+
+    @property
+    def month(self) -> float:
+        "exact months, same count as `dat._convert_to_.month`"
+        return _seconds_to_exact_months(self.rawtime)
+
+    @property
+    def day(self) -> float:
+        return self.rawtime / 86400
+
+    @property
+    def hour(self) -> float:
+        return self.rawtime / 3600
+
+    @property
+    def minute(self) -> float:
+        return self.rawtime / 60
+
+    @property
+    def second(self) -> float | int:
+        return self.rawtime
+
+#-----Binary-Serialization-------
+_RECORD = struct.Struct("<dd")  # rawtime, drift
+RECORD_SIZE:int = _RECORD.size
+
+def dump_many(dats, fp, *, chunk_size: int = 4096) -> int:
+    """
+    Streams an iterable of dat objects into the binary file object `fp` as consecutive `dat.to_bytes` records,
+    writing `chunk_size` records at a time. Returns the number of records written.
+    """
+    pack = _RECORD.pack
+    written = 0
+    chunk = []
+    for item in dats:
+        chunk.append(pack(item.rawtime, item.drift))
+        if len(chunk) >= chunk_size:
+            fp.write(b"".join(chunk))
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        fp.write(b"".join(chunk))
+        written += len(chunk)
+    return written
+
+def load_many(fp, *, chunk_size: int = 4096, cls: type = dat):
+    """
+    Generator reading the records written by `dump_many` back from the binary file object `fp`,
+    `chunk_size` records per read. Yields lazy dat objects (no calendar decomposition until they are used).
+    """
+    compiler = cls.input_compiler
+    while True:
+        block = fp.read(chunk_size * RECORD_SIZE)
+        if not block:
+            return
+        if len(block) % RECORD_SIZE:
+            raise ValueError(f"truncated dat record: {len(block) % RECORD_SIZE} trailing bytes")
+        for rawtime, drift in _RECORD.iter_unpack(block):
+            yield compiler(rawtime, drift=drift, output=None)
+
+#-----Late-Imports-------
+# offsets reads this module through `_core` at call time only, so it can be imported once everything above exists;
+# OffsetRule is then a module global for the drift handling and for the annotations (typing.get_type_hints)
+from .offsets import OffsetRule
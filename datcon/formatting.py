@@ -0,0 +1,86 @@
+from __future__ import annotations
+from functools import lru_cache
+
+from .datcon import dat, _is_leap_year, _DAYS_BEFORE_MONTH, _DAYS_BEFORE_MONTH_LEAP
+
+__all__ = ["DatFormat", "format_many"]
+
+# directive -> str.format field over (Y, M, D, h, mi, whole seconds, microseconds, era name, rawtime, day of year)
+_DIRECTIVES:dict[str, str] = {
+    "Y": "{0:04}",
+    "m": "{1:02}",
+    "d": "{2:02}",
+    "H": "{3:02}",
+    "M": "{4:02}",
+    "S": "{5:02}",
+    "f": "{6:06}",
+    "E": "{7}",
+    "s": "{8}",
+    "j": "{9:03}",
+}
+
+class DatFormat:
+    """strftime-style format compiled once into a single `str.format` template, so formatting a dat is one call instead of one per field. Supported directives: %Y year, %m month, %d day, %H hour, %M minute, %S whole seconds, %f microseconds, %j day of the year, %E era name (AC / BC), %s rawtime and %% for a literal percent sign; anything else raises ValueError when compiling."""
+    __slots__ = ("pattern", "_format", "_micro", "_era", "_day_of_year")
+
+    def __init__(self, pattern: str):
+        """Compile `pattern`, e.g. `"%Y-%m-%dT%H:%M:%S.%f"`."""
+        self.pattern:str = pattern
+        pieces = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char != "%":
+                pieces.append("{{" if char == "{" else "}}" if char == "}" else char)
+                i += 1
+                continue
+            directive = pattern[i + 1:i + 2]
+            if directive == "%":
+                pieces.append("%")
+            elif directive in _DIRECTIVES:
+                pieces.append(_DIRECTIVES[directive])
+            else:
+                raise ValueError(f"unsupported format directive %{directive} in {pattern!r}")
+            i += 2
+        template = "".join(pieces)
+        self._format = template.format
+        # fields that cost something are only computed when the pattern uses them
+        self._micro:bool = "{6" in template
+        self._era:bool = "{7" in template
+        self._day_of_year:bool = "{9" in template
+
+    def __repr__(self) -> str:
+        return f"DatFormat({self.pattern!r})"
+
+    def format(self, item: dat) -> str:
+        "formats one dat, its components are read without being stored on it"
+        Y, M, D, h, mi, s = item.components()
+        whole = int(s)
+        micro = round((s - whole) * 1000000) if self._micro else 0
+        era = item.epoch_type.name if self._era else ""
+        day_of_year = 0
+        if self._day_of_year:
+            day_of_year = (_DAYS_BEFORE_MONTH_LEAP if _is_leap_year(Y) else _DAYS_BEFORE_MONTH)[M - 1] + D
+        return self._format(Y, M, D, h, mi, whole, micro, era, item.rawtime, day_of_year)
+
+    __call__ = format
+
+@lru_cache(maxsize=64)
+def compile_format(pattern: str) -> DatFormat:
+    "cached DatFormat per pattern string, used by dat.strftime"
+    return DatFormat(pattern)
+
+def format_many(dats, fmt: str | DatFormat, out, *, end: str = "\n") -> int:
+    """
+    Writes every dat of `dats` formatted with `fmt` to the text stream `out` (a file, io.StringIO, ...),
+    each one followed by `end`. `end` is compiled into the format, so every record is a single string
+    built by a single call. Returns the number of records written.
+    """
+    pattern = fmt.pattern if isinstance(fmt, DatFormat) else fmt
+    line = DatFormat(pattern + end.replace("%", "%%")).format
+    count = 0
+    write = out.write
+    for item in dats:
+        write(line(item))
+        count += 1
+    return count
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+
+from .datcon import dat, Maths_Support, _exact_key
+
+__all__ = ["DatIndex"]
+
+class DatIndex:
+    """Sorted mapping keyed by dat (ordered and deduplicated on the exact rawtime, the same rule as dat's __eq__/__hash__, so TickDats a tick apart stay apart). Entries live in buckets of at most `2 * load` sorted rawtimes with a list of bucket maxima on top, so insert, lookup, floor/ceil and range slicing cost a binary search over the buckets plus one inside a bucket, instead of the O(n) list insert or scan a flat list would need. Keys may be given as dats or plain rawtime numbers."""
+
+    def __init__(self, items = (), *, load: int = 512):
+        """Build the index from an iterable of dats or `(dat, value)` pairs; later duplicates replace earlier ones."""
+        self._load:int = load
+        self._keys:list[list[float | Fraction]] = []  # exact rawtimes, sorted inside and across buckets
+        self._dats:list[list[dat]] = []
+        self._values:list[list] = []
+        self._maxes:list[float] = []  # last rawtime of every bucket
+        self._len:int = 0
+        for item in items:
+            if isinstance(item, tuple):
+                self.insert(*item)
+            else:
+                self.insert(item)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"DatIndex({len(self)} entries)"
+
+    def _find(self, key: float) -> tuple[int, int] | None:
+        "bucket and position of `key`, None if missing"
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return None
+        keys = self._keys[pos]
+        i = bisect_left(keys, key)
+        if keys[i] != key:
+            return None
+        return pos, i
+
+    def insert(self, key: dat, value = None) -> bool:
+        """
+        adds `key` with its `value`, replacing the entry that has the same rawtime if there is one,\n
+        returns True when a new entry was created
+        """
+        raw = _exact_key(key)
+        if not isinstance(key, Maths_Support):
+            key = dat.operand(raw)
+        if not self._maxes:
+            self._keys.append([raw])
+            self._dats.append([key])
+            self._values.append([value])
+            self._maxes.append(raw)
+            self._len = 1
+            return True
+
+        pos = bisect_left(self._maxes, raw)
+        if pos == len(self._maxes):
+            pos -= 1  # past every key, append to the last bucket
+        keys = self._keys[pos]
+        i = bisect_left(keys, raw)
+        if i < len(keys) and keys[i] == raw:
+            self._dats[pos][i] = key
+            self._values[pos][i] = value
+            return False
+
+        keys.insert(i, raw)
+        self._dats[pos].insert(i, key)
+        self._values[pos].insert(i, value)
+        self._maxes[pos] = keys[-1]
+        self._len += 1
+        if len(keys) > 2 * self._load:
+            self._split(pos)
+        return True
+
+    def _split(self, pos: int) -> None:
+        half = self._load
+        for column in (self._keys, self._dats, self._values):
+            bucket = column[pos]
+            column.insert(pos + 1, bucket[half:])
+            del bucket[half:]
+        self._maxes.insert(pos, self._keys[pos][-1])
+
+    def remove(self, key: dat | float | int) -> None:
+        "removes the entry with the rawtime of `key`, KeyError if it isn't there"
+        found = self._find(_exact_key(key))
+        if found is None:
+            raise KeyError(key)
+        pos, i = found
+        for column in (self._keys, self._dats, self._values):
+            del column[pos][i]
+        self._len -= 1
+        if self._keys[pos]:
+            self._maxes[pos] = self._keys[pos][-1]
+        else:
+            for column in (self._keys, self._dats, self._values, self._maxes):
+                del column[pos]
+
+    def __setitem__(self, key: dat, value) -> None:
+        self.insert(key, value)
+
+    def __delitem__(self, key: dat | float | int) -> None:
+        self.remove(key)
+
+    def __contains__(self, key) -> bool:
+        if not isinstance(key, (Maths_Support, int, float)):
+            return False
+        return self._find(_exact_key(key)) is not None
+
+    def get(self, key: dat | float | int, default = None):
+        found = self._find(_exact_key(key))
+        if found is None:
+            return default
+        pos, i = found
+        return self._values[pos][i]
+
+    def __getitem__(self, key):
+        """`index[dat]` returns the value stored for that instant, `index[start:stop]` the `(dat, value)` pairs with start <= key < stop"""
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("DatIndex slices don't support a step")
+            return list(self.irange(key.start, key.stop))
+        found = self._find(_exact_key(key))
+        if found is None:
+            raise KeyError(key)
+        pos, i = found
+        return self._values[pos][i]
+
+    def __iter__(self):
+        "dat keys in ascending order"
+        for bucket in self._dats:
+            yield from bucket
+
+    def items(self):
+        for dats, values in zip(self._dats, self._values):
+            yield from zip(dats, values)
+
+    def floor(self, key: dat | float | int) -> dat | None:
+        "greatest key <= `key`, None if there is none"
+        raw = _exact_key(key)
+        pos = bisect_left(self._maxes, raw)
+        if pos == len(self._maxes):
+            return self._dats[-1][-1] if self._dats else None
+        i = bisect_right(self._keys[pos], raw)
+        if i:
+            return self._dats[pos][i - 1]
+        return self._dats[pos - 1][-1] if pos else None
+
+    def ceil(self, key: dat | float | int) -> dat | None:
+        "smallest key >= `key`, None if there is none"
+        raw = _exact_key(key)
+        pos = bisect_left(self._maxes, raw)
+        if pos == len(self._maxes):
+            return None
+        return self._dats[pos][bisect_left(self._keys[pos], raw)]
+
+    def irange(self, start: dat | float | int | None = None, stop: dat | float | int | None = None):
+        "yields the `(dat, value)` pairs with start <= key < stop in order, a None bound is open"
+        if start is None:
+            pos, i = 0, 0
+        else:
+            raw = _exact_key(start)
+            pos = bisect_left(self._maxes, raw)
+            i = bisect_left(self._keys[pos], raw) if pos < len(self._maxes) else 0
+        stop = None if stop is None else _exact_key(stop)
+        while pos < len(self._keys):
+            keys = self._keys[pos]
+            end = len(keys) if stop is None or self._maxes[pos] < stop else bisect_left(keys, stop, i)
+            yield from zip(self._dats[pos][i:end], self._values[pos][i:end])
+            if end < len(keys):
+                return
+            pos, i = pos + 1, 0
@@ -0,0 +1,102 @@
+"""
+Opt-in instrumentation of datcon's construction hot path.
+
+while enabled, every stage below is wrapped to count its calls and accumulate its (inclusive) wall time,
+and the calendar / normalization loops report how many iterations they ran. while disabled the original
+functions are back in place and the loop hooks are a single `is not None` check, so nothing is paid
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+from . import datcon as _core
+from .datcon import dat, dat_support
+
+__all__ = ["enable_instrumentation", "disable_instrumentation", "reset_instrumentation",
+           "instrumentation_snapshot", "instrumented"]
+
+# (owner class, attribute) of every timed stage, values_to_rawtime shows how often normalize_full is skipped
+STAGES:tuple = (
+    (dat, "value_template_extractor"),
+    (dat, "values_to_rawtime"),
+    (dat, "normalize_full"),
+    (dat, "convert_input_to_rawtime"),
+    (dat, "convert_rawtime_to_date"),
+    (dat_support, "__init__"),
+)
+
+_stages:dict[str, list] = {}  # "owner.attribute" -> [calls, seconds]
+_loops:dict[str, int] = {}
+_originals:dict = {}  # (owner, attribute) -> function replaced while enabled
+
+def _stage_name(owner: type, attribute: str) -> str:
+    return f"{owner.__name__}.{attribute}"
+
+def _timed(name: str, function):
+    record = _stages.setdefault(name, [0, 0.0])
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record[0] += 1
+            record[1] += perf_counter() - start
+    return wrapper
+
+def enable_instrumentation() -> None:
+    "Starts counting calls, time and loop iterations (keeps what was already collected, see reset_instrumentation)."
+    if _originals:
+        return
+    for owner, attribute in STAGES:
+        function = owner.__dict__[attribute]
+        _originals[(owner, attribute)] = function
+        setattr(owner, attribute, _timed(_stage_name(owner, attribute), function))
+    _core._loop_counts = _loops
+
+def disable_instrumentation() -> None:
+    "Puts the original functions back; the collected numbers stay readable through instrumentation_snapshot."
+    for (owner, attribute), function in _originals.items():
+        setattr(owner, attribute, function)
+    _originals.clear()
+    _core._loop_counts = None
+
+def reset_instrumentation() -> None:
+    "Zeroes every counter, enabled or not."
+    for record in _stages.values():
+        record[0], record[1] = 0, 0.0
+    _loops.clear()
+
+def instrumentation_snapshot() -> dict:
+    """
+    Copy of the collected numbers:
+    `{"enabled": bool, "stages": {"dat.normalize_full": {"calls": int, "seconds": float}, ...}, "loops": {"normalize_full.day_loop": int, ...}}`
+    """
+    return {
+        "enabled": bool(_originals),
+        "stages": {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in _stages.items()},
+        "loops": dict(_loops),
+    }
+
+@contextmanager
+def instrumented(*, reset: bool = True):
+    """
+    Instruments the block and fills the yielded dict with `instrumentation_snapshot()` when it ends:\n
+        with datcon.instrumented() as report:
+            ...
+        report["stages"]["dat.normalize_full"]["calls"]
+    counters are zeroed first unless `reset=False`, an outer enable is left untouched
+    """
+    already_enabled = bool(_originals)
+    if reset:
+        reset_instrumentation()
+    enable_instrumentation()
+    report = {}
+    try:
+        yield report
+    finally:
+        report.update(instrumentation_snapshot())
+        if not already_enabled:
+            disable_instrumentation()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+from operator import itemgetter
+
+from .datcon import dat, Duration, _exact_key
+
+__all__ = ["DatInterval", "merge_intervals", "overlap_join", "points_in_intervals"]
+
+class DatInterval:
+    """Half-open span of time `[start, end)` between two dats, ordered and compared on their exact rawtimes (the same rule as dat's __eq__, so TickDat endpoints a tick apart stay apart). `start` is included and `end` is not, so back to back intervals (one ends where the next starts) don't overlap but still merge. Bulk operations over many intervals live next to it: merge_intervals, overlap_join and points_in_intervals, all sorted sweep-lines costing O(n log n + matches) instead of comparing every pair."""
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: dat, end: dat):
+        if _exact_key(end) < _exact_key(start):
+            raise ValueError(f"interval end {end} is before its start {start}")
+        self.start:dat = start
+        self.end:dat = end
+
+    def __repr__(self) -> str:
+        return f"DatInterval({self.start}, {self.end})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DatInterval):
+            return NotImplemented
+        return _exact_key(self.start) == _exact_key(other.start) and _exact_key(self.end) == _exact_key(other.end)
+
+    def __hash__(self) -> int:
+        return hash((_exact_key(self.start), _exact_key(self.end)))
+
+    def __contains__(self, point: dat | float | int) -> bool:
+        "start <= point < end"
+        return _exact_key(self.start) <= _exact_key(point) < _exact_key(self.end)
+
+    @property
+    def duration(self) -> Duration:
+        return Duration(self.end.rawtime - self.start.rawtime)
+
+    def overlaps(self, other: DatInterval) -> bool:
+        "True when both intervals share at least one instant (start < other.end and other.start < end)"
+        return _exact_key(self.start) < _exact_key(other.end) and _exact_key(other.start) < _exact_key(self.end)
+
+def _sorted_spans(intervals) -> list[tuple[float, float, DatInterval]]:
+    "(start, end, interval) sorted by start, the exact rawtimes (Fractions for TickDat) are read once"
+    spans = [(_exact_key(item.start), _exact_key(item.end), item) for item in intervals]
+    spans.sort(key=itemgetter(0))
+    return spans
+
+def merge_intervals(intervals, *, adjacent: bool = True) -> list[DatInterval]:
+    """
+    coalesces overlapping intervals into the sorted list of disjoint intervals covering the same instants,\n
+    back to back intervals are joined too unless `adjacent=False`. the endpoints are the original dat objects
+    """
+    merged = []
+    current_end = None
+    start_dat = end_dat = None
+    for start, end, item in _sorted_spans(intervals):
+        if current_end is not None and (start < current_end or (adjacent and start == current_end)):
+            if end > current_end:
+                current_end, end_dat = end, item.end
+            continue
+        if current_end is not None:
+            merged.append(DatInterval(start_dat, end_dat))
+        current_end = end
+        start_dat, end_dat = item.start, item.end
+    if current_end is not None:
+        merged.append(DatInterval(start_dat, end_dat))
+    return merged
+
+def overlap_join(left, right):
+    """
+    yields every `(left_interval, right_interval)` pair that overlaps, in order of the later start of the two.\n
+    both sides are sorted once and swept together keeping only the intervals still open at the sweep position,
+    so the cost is the sort plus one step per match instead of len(left) * len(right) comparisons
+    """
+    # (start, side, end, interval), at equal starts left comes first, it doesn't change which pairs are found
+    events = [(start, 0, end, item) for start, end, item in _sorted_spans(left)]
+    events += [(start, 1, end, item) for start, end, item in _sorted_spans(right)]
+    events.sort(key=itemgetter(0, 1))
+    active = ([], [])  # open (start, end, interval) per side
+    for start, side, end, item in events:
+        other = active[1 - side]
+        if other:
+            # anything that ended at or before this start can't overlap this or any later interval
+            still_open = [entry for entry in other if entry[1] > start]
+            if len(still_open) != len(other):
+                other[:] = still_open
+            # what is left started at or before `start` and ends after it, only an empty interval at the same start misses
+            for other_start, _, other_item in other:
+                if other_start < end:
+                    yield (item, other_item) if side == 0 else (other_item, item)
+        active[side].append((start, end, item))
+
+def points_in_intervals(points, intervals):
+    """
+    yields `(point, interval)` for every point (dat or rawtime) inside every interval containing it, points in ascending order.\n
+    the intervals are sorted by start and the points swept over them, only the intervals open at the current point are looked at
+    """
+    spans = _sorted_spans(intervals)
+    ordered = sorted(((_exact_key(point), point) for point in points), key=itemgetter(0))
+    active = []
+    i = 0
+    for raw, point in ordered:
+        while i < len(spans) and spans[i][0] <= raw:
+            active.append(spans[i])
+            i += 1
+        if active:
+            still_open = [entry for entry in active if entry[1] > raw]
+            if len(still_open) != len(active):
+                active = still_open
+            for _, _, item in active:
+                yield point, item
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, plain sequences are resolved with bisect
+    np = None
+
+from . import datcon as _core  # calendar helpers are read at call time, enable_calendar_cache swaps them
+
+__all__ = ["OffsetRule"]
+
+def _weekday(days: int) -> int:
+    "0 = monday .. 6 = sunday for a day count since 0000-01-01 (a saturday)"
+    return (days + 5) % 7
+
+def _nth_weekday(year: int, month: int, week: int, weekday: int) -> int:
+    "day count of the `week`-th `weekday` of the month (week -1 -> the last one)"
+    if week < 0:
+        last = _core._ymd_to_days(year + month // 12, month % 12 + 1, 1) - 1
+        return last - (_weekday(last) - weekday) % 7
+    first = _core._ymd_to_days(year, month, 1)
+    return first + (weekday - _weekday(first)) % 7 + (week - 1) * 7
+
+class OffsetRule:
+    """Offset that changes over time, accepted wherever a `drift` is (stamp, datetime, operand, current_time, parse_many). A rule has a `standard` offset and, optionally, a `daylight` offset in force between a yearly `start` and `end` transition, each given as `(month, week, weekday, seconds)`: the `week`-th (-1 for last) `weekday` (0 monday .. 6 sunday) of `month`, `seconds` after midnight UTC (or local standard / daylight time with `utc=False`). Transitions are precomputed into sorted tables one span of years at a time and looked up with a binary search, the tables grow on their own when a rawtime outside them shows up. Offsets use the same sign as a numeric drift, so `OffsetRule(7200)` behaves like `drift=7200`."""
+    __slots__ = ("standard", "daylight", "start", "end", "utc", "name",
+                 "_first_year", "_last_year", "_low", "_high", "_points", "_local_points", "_after", "_before", "_arrays")
+
+    # years covered when the tables are first built, then extended on demand
+    DEFAULT_SPAN:tuple[int, int] = (1900, 2100)
+
+    def __init__(self, standard: float | int, daylight: float | int | None = None, start: tuple[int, int, int, int] | None = None,
+                 end: tuple[int, int, int, int] | None = None, *, utc: bool = True, name: str = ""):
+        if (daylight is None) != (start is None) or (start is None) != (end is None):
+            raise ValueError("daylight, start and end have to be given together")
+        self.standard:float = float(standard)
+        self.daylight:float | None = None if daylight is None else float(daylight)
+        self.start = start
+        self.end = end
+        self.utc:bool = utc
+        self.name:str = name
+        self._first_year:int | None = None
+        self._last_year:int | None = None
+        self._low:float = 0.0  # rawtimes in [_low, _high) are answered by the current tables
+        self._high:float = 0.0
+        self._points:list[float] = []  # transition rawtimes (UTC timeline), sorted
+        self._local_points:list[float] = []  # same transitions read on the wall clock they leave
+        self._after:list[float] = []  # offset in force from points[i] on
+        self._before:float = self.standard  # offset before points[0]
+        self._arrays = None  # numpy copies of the tables for the batch API
+
+    @classmethod
+    def fixed(cls, offset: float | int, *, name: str = "") -> OffsetRule:
+        "constant offset, same as passing the number as drift"
+        return cls(offset, name=name)
+
+    @classmethod
+    def central_european(cls) -> OffsetRule:
+        """CET / CEST: +3600, +7200 from the last sunday of march to the last sunday of october at 01:00 UTC (CENTRAL_EUROPEAN_TIMELINE is the summer value)"""
+        return cls(3600, 7200, (3, -1, 6, 3600), (10, -1, 6, 3600), name="CET/CEST")
+
+    def __repr__(self) -> str:
+        if self.daylight is None:
+            return f"OffsetRule({self.standard:g})"
+        return f"OffsetRule({self.standard:g}, {self.daylight:g}, {self.start}, {self.end}, utc={self.utc}, name={self.name!r})"
+
+    #-----Tables-------
+    def _transitions(self, year: int) -> list[tuple[float, float, float]]:
+        "(utc rawtime, offset before, offset after) of both transitions of `year`, in the order they happen"
+        found = []
+        for rule, before, after in ((self.start, self.standard, self.daylight), (self.end, self.daylight, self.standard)):
+            month, week, weekday, seconds = rule
+            moment = _nth_weekday(year, month, week, weekday) * 86400 + seconds
+            if not self.utc:
+                moment -= before  # the wall clock reading is in the offset that is ending
+            found.append((moment, before, after))
+        found.sort()
+        return found
+
+    def _build(self, first_year: int, last_year: int) -> None:
+        "(re)computes the tables for every transition from `first_year` to `last_year`, both included"
+        points, local_points, after = [], [], []
+        for year in range(first_year, last_year + 1):
+            for moment, offset_before, offset_after in self._transitions(year):
+                points.append(moment)
+                local_points.append(moment + offset_before)
+                after.append(offset_after)
+        self._first_year, self._last_year = first_year, last_year
+        self._low = float("-inf") if first_year == 0 else _core._ymd_to_days(first_year + 1, 1, 1) * 86400
+        self._high = _core._ymd_to_days(last_year, 1, 1) * 86400
+        self._points, self._local_points, self._after = points, local_points, after
+        self._before = self.standard if after and after[0] == self.daylight else self.daylight
+        self._arrays = None
+
+    def _cover(self, low: float, high: float) -> None:
+        "makes sure the tables span the years of the rawtimes `low` and `high`"
+        if self._low <= low and high < self._high:
+            return
+        if self._first_year is None:
+            self._build(*self.DEFAULT_SPAN)
+            if self._low <= low and high < self._high:
+                return
+        # one year of margin so transitions near new year, shifted by the offset, are still in the table
+        low_year = max(_core._days_to_ymd(int(max(low, 0) // 86400))[0] - 1, 0)
+        high_year = _core._days_to_ymd(int(max(high, 0) // 86400))[0] + 1
+        if low_year < self._first_year or high_year > self._last_year:
+            self._build(min(low_year, self._first_year), max(high_year, self._last_year))
+
+    #-----Lookups-------
+    def offset_at(self, rawtime: float | int) -> float:
+        "offset in force at `rawtime` on the UTC timeline"
+        if self.daylight is None:
+            return self.standard
+        self._cover(rawtime, rawtime)
+        i = bisect_right(self._points, rawtime)
+        return self._after[i - 1] if i else self._before
+
+    def offset_at_local(self, rawtime: float | int) -> float:
+        """
+        offset in force at the wall clock reading `rawtime`, the lookup operand does to get back to UTC,\n
+        a reading skipped by a transition gets the new offset, a repeated one the offset that was in force first
+        """
+        if self.daylight is None:
+            return self.standard
+        self._cover(rawtime, rawtime)
+        i = bisect_right(self._local_points, rawtime)
+        return self._after[i - 1] if i else self._before
+
+    def offsets(self, rawtimes, *, local: bool = False):
+        """
+        batch offset_at (offset_at_local if `local=True`) for many rawtimes at once,\n
+        numpy arrays (and DatArrays, through their rawtime column) are resolved with a single searchsorted and give back a float64 array,
+        any other iterable gives back a list
+        """
+        if hasattr(rawtimes, "rawtime") and np is not None and isinstance(rawtimes.rawtime, np.ndarray):
+            rawtimes = rawtimes.rawtime
+        if np is not None and isinstance(rawtimes, np.ndarray):
+            if self.daylight is None:
+                return np.full(rawtimes.shape, self.standard)
+            if rawtimes.size:
+                self._cover(float(rawtimes.min()), float(rawtimes.max()))
+            if self._arrays is None:
+                self._arrays = (np.asarray(self._points, dtype=np.float64), np.asarray(self._local_points, dtype=np.float64),
+                                np.asarray([self._before, *self._after], dtype=np.float64))
+            points, local_points, after = self._arrays
+            return after[np.searchsorted(local_points if local else points, rawtimes, side="right")]
+
+        rawtimes = list(rawtimes)
+        if self.daylight is None:
+            return [self.standard] * len(rawtimes)
+        if rawtimes:
+            self._cover(min(rawtimes), max(rawtimes))
+        points = self._local_points if local else self._points
+        after = [self._before, *self._after]
+        return [after[bisect_right(points, raw)] for raw in rawtimes]
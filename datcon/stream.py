@@ -0,0 +1,107 @@
+"""
+Bulk conversion of timestamp streams.
+
+`convert_stream` reads one timestamp per line (or one column of a CSV file), parses them with a `stamp`
+template through `dat.parse_many` and writes one rawtime, or one `strftime`-style formatted value, per input row.
+rows are converted in chunks, spread over a process pool when `workers` > 1, with at most a few chunks per
+worker in flight so memory stays bounded whatever the input size, and written back in input order
+"""
+from __future__ import annotations
+from collections import deque
+from functools import partial
+from itertools import islice
+import csv
+import os
+
+from .datcon import dat, AC, EpochType
+
+__all__ = ["convert_stream"]
+
+def _convert_chunk(lines: list[str], template: str, epoch_type: EpochType, drift, pattern: str | None) -> str:
+    "converts one chunk and returns its output block, runs inside the worker processes"
+    rows = [line.strip() for line in lines]
+    present = [row for row in rows if row]
+    parsed = iter(dat.parse_many(present, template, epoch_type, drift=drift))
+    if pattern is None:
+        render = lambda item: repr(item.rawtime)
+    else:
+        from .formatting import compile_format
+        render = compile_format(pattern).format
+    # blank rows stay blank so output line n always belongs to input row n
+    return "".join(f"{render(next(parsed))}\n" if row else "\n" for row in rows)
+
+def _rows(source, column: int | str | None, delimiter: str, header: bool):
+    "the timestamp text of every input row"
+    if column is None:
+        if header:
+            next(source, None)
+        yield from source
+        return
+    reader = csv.reader(source, delimiter=delimiter)
+    index = column
+    if header:
+        names = next(reader, [])
+        if isinstance(column, str):
+            if column not in names:
+                raise ValueError(f"column {column!r} not found in the header {names}")
+            index = names.index(column)
+    elif isinstance(column, str):
+        raise ValueError("a column name needs header=True, use the column number otherwise")
+    for row in reader:
+        yield row[index] if index < len(row) else ""
+
+def _chunks(rows, size: int):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _in_order(executor, function, chunks, depth: int):
+    "executor.map that only keeps `depth` chunks in flight instead of submitting the whole input up front"
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(function, chunk))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def convert_stream(source, destination, template: str, *, epoch_type: EpochType = AC, drift = 0, pattern: str | None = None,
+                   column: int | str | None = None, delimiter: str = ",", header: bool = False,
+                   workers: int | None = None, chunk_size: int = 20000) -> int:
+    """
+    Converts every timestamp of `source` and writes the results to `destination`, returns the number of rows.\n
+    `source` / `destination` are text file objects or paths. every row is parsed like `dat.stamp(row, template, epoch_type, drift=drift)`,
+    `drift` being anything dat accepts (a number, a dat, an `OffsetRule`). the rawtime is written unless a `pattern`
+    (see `DatFormat`) is given. with `column` (number, or name when `header=True`) the input is read as CSV.\n
+    `workers` processes share the work (default: one per CPU, 0 or 1 converts in this process), `chunk_size` rows at a time
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", newline="") as fp:
+            return convert_stream(fp, destination, template, epoch_type=epoch_type, drift=drift, pattern=pattern, column=column,
+                                  delimiter=delimiter, header=header, workers=workers, chunk_size=chunk_size)
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", encoding="utf-8") as fp:
+            return convert_stream(source, fp, template, epoch_type=epoch_type, drift=drift, pattern=pattern, column=column,
+                                  delimiter=delimiter, header=header, workers=workers, chunk_size=chunk_size)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    function = partial(_convert_chunk, template=template, epoch_type=epoch_type, drift=drift, pattern=pattern)
+    chunks = _chunks(_rows(source, column, delimiter, header), chunk_size)
+    count = 0
+    write = destination.write
+
+    if workers <= 1:
+        for block in map(function, chunks):
+            write(block)
+            count += block.count("\n")
+        return count
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        for block in _in_order(executor, function, chunks, 2 * workers):
+            write(block)
+            count += block.count("\n")
+    return count
@@ -0,0 +1,376 @@
+from __future__ import annotations
+from fractions import Fraction
+from functools import lru_cache
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the int64 array helpers need it
+    np = None
+
+from . import datcon as _core  # calendar helpers are read at call time, enable_calendar_cache swaps them
+from .datcon import dat, dat_support, Maths_Support, Duration, EpochType, AC, BC
+
+__all__ = ["TickDat"]
+
+_HASH_MODULUS:int = sys.hash_info.modulus
+
+@lru_cache(maxsize=None)
+def _hash_inverse(ticks_per_second: int) -> int:
+    # the modulus is prime, so Fermat's little theorem gives the inverse (pow(x, -1, m) needs python 3.8)
+    return pow(ticks_per_second, _HASH_MODULUS - 2, _HASH_MODULUS)
+
+def _seconds_to_ticks(seconds: float | int | Fraction, ticks_per_second: int) -> int:
+    "exact for ints and fractions, floats are split first so the whole seconds never go through a float product"
+    if isinstance(seconds, int):
+        return seconds * ticks_per_second
+    if isinstance(seconds, Fraction):
+        return round(seconds * ticks_per_second)
+    whole = int(seconds)
+    return whole * ticks_per_second + round((seconds - whole) * ticks_per_second)
+
+class TickDat(dat):
+    """dat stored as an integer count of fixed ticks since 0000-01-01 instead of float seconds. `TICKS_PER_SECOND` (1_000_000, microseconds) sets the resolution; subclass and change it for e.g. 100 ns ticks (10_000_000). Addition, subtraction, comparisons, equality and hashing work on the ints, so they are exact at any year, and the components keep the full tick resolution instead of the 4 decimals float dats round their seconds to. `rawtime` is still readable and writable in seconds, so every dat constructor and method works unchanged; whole years of microseconds stay inside int64 up to year ~292000."""
+    __slots__ = ("ticks",)
+
+    TICKS_PER_SECOND:int = 1_000_000
+
+    @property
+    def rawtime(self) -> float:
+        "seconds view of `ticks`, assigning seconds rounds them to the nearest tick"
+        return self.ticks / self.TICKS_PER_SECOND
+
+    @rawtime.setter
+    def rawtime(self, value: float | int) -> None:
+        self.ticks = _seconds_to_ticks(value, self.TICKS_PER_SECOND)
+
+    # what copy / pickle carry: the inherited `rawtime` slot is left out, restoring it would go through the float
+    # property setter after `ticks` and round the ticks to what a float can hold
+    _STATE_SLOTS:tuple[str] = ("ticks", *dat.__slots__)
+
+    def __getstate__(self) -> dict:
+        return {name: getattr(self, name) for name in self._STATE_SLOTS if hasattr(self, name)}
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def output(self) -> list:
+        if self._output is None:
+            self._output = [self.ticks_to_date(abs(self.ticks)), "fulldat"]
+        return self._output
+
+    @output.setter
+    def output(self, value: list) -> None:
+        self._output = value
+
+    def components(self) -> list:
+        return self._output[0] if self._output is not None else self.ticks_to_date(abs(self.ticks))
+
+    def __float__(self) -> float:
+        return self.rawtime
+
+    def __int__(self) -> int:
+        seconds = abs(self.ticks) // self.TICKS_PER_SECOND
+        return seconds if self.ticks >= 0 else -seconds
+
+    @classmethod
+    def from_ticks(cls, ticks: int, *, drift: dat | float | int = 0) -> TickDat:
+        "builds a (lazy) TickDat straight from a tick count, `drift` is only recorded, ticks are taken as they are"
+        self = cls()
+        self.ticks = int(ticks)
+        self.drift = self.drift_converter(drift)
+        self.epoch_type = BC if ticks < 0 else AC
+        dat_support.__init__(self)
+        return self
+
+    @classmethod
+    def to_array(cls, dats) -> np.ndarray:
+        "int64 array of the ticks of `dats` (TickDats of this resolution, any other dat is rounded to a tick), needs numpy"
+        if np is None:
+            raise ImportError("TickDat.to_array needs numpy, install it with `pip install numpy` or `pip install datcoM[numpy]`")
+        tps = cls.TICKS_PER_SECOND
+        return np.fromiter(
+            (item.ticks if isinstance(item, TickDat) and item.TICKS_PER_SECOND == tps else _seconds_to_ticks(item.rawtime, tps)
+             for item in dats),
+            dtype=np.int64)
+
+    @classmethod
+    def from_array(cls, ticks) -> list[TickDat]:
+        "reverse of `to_array`, one lazy TickDat per tick count"
+        from_ticks = cls.from_ticks
+        return [from_ticks(value) for value in (ticks.tolist() if hasattr(ticks, "tolist") else ticks)]
+
+    @classmethod
+    def to_datetime64(cls, dats) -> np.ndarray:
+        """
+        datetime64 array of `dats` at the tick resolution (datetime64[us] for the default microseconds), exact:
+        the int64 ticks are shifted to the unix epoch in one vectorized step and viewed as datetime64, never through floats
+        """
+        from .datarray import _ticks_to_datetime64
+        return _ticks_to_datetime64(cls.to_array(dats), cls.TICKS_PER_SECOND)
+
+    @classmethod
+    def from_datetime64(cls, values) -> list[TickDat]:
+        "reverse of `to_datetime64`, values finer than a tick are floored to it"
+        from .datarray import _datetime64_to_ticks
+        return cls.from_array(_datetime64_to_ticks(values, cls.TICKS_PER_SECOND))
+
+    def _exact_rawtime(self) -> Fraction:
+        return Fraction(self.ticks, self.TICKS_PER_SECOND)
+
+    def _set_rawtime(self, seconds: float | int, microseconds: int) -> None:
+        tps = self.TICKS_PER_SECOND
+        self.ticks = _seconds_to_ticks(seconds, tps) + (microseconds * tps + 500_000) // 1_000_000
+
+    def _moved_by_days(self, days: int, ymd: tuple[int, int, int]) -> TickDat:
+        moved = self.from_ticks(self.ticks + days * 86400 * self.TICKS_PER_SECOND, drift=self.drift)
+        moved.output = [[*ymd, *self.ticks_to_date(abs(moved.ticks))[3:]], "fulldat"]
+        return moved
+
+    @classmethod
+    def range(cls, start: dat, stop: dat | None = None, step: int | float = 1, unit: str = "d"):
+        """
+        dat.range in ticks: the values are `start` plus whole multiples of the step in ticks, counted from the ticks of
+        `start` instead of its float rawtime, and their seconds keep the tick resolution. "m" / "y" steps go through the
+        exact `_moved_by_days` calendar shift
+        """
+        if unit not in cls.TIME_UNITS:
+            raise ValueError(f"unknown unit {unit!r}, expected one of {list(cls.TIME_UNITS)}")
+        if not step:
+            raise ValueError("step can't be 0")
+        tps = cls.TICKS_PER_SECOND
+        if isinstance(start, TickDat) and start.TICKS_PER_SECOND == tps:
+            base = start.ticks
+        else:
+            base = _seconds_to_ticks(start._exact_rawtime(), tps)
+        limit = None
+        if stop is not None:
+            limit = Fraction(stop._exact_rawtime() if isinstance(stop, dat) else _core._key(stop)) * tps
+            limit = int(limit) if limit.denominator == 1 else limit
+
+        def reached(ticks):
+            return limit is not None and (ticks >= limit if step > 0 else ticks <= limit)
+
+        drift = start.drift
+        first = cls.from_ticks(base, drift=drift)
+
+        if unit in ("m", "y"):
+            if base < 0:
+                raise ValueError("calendar steps are only defined for AC dats")
+            Y, M, D = first.data[0:3]
+            start_days = _core._ymd_to_days(Y, M, D)
+            months_step = step * 12 if unit == "y" else step
+            if months_step % 1:
+                raise ValueError("calendar steps must be whole months / years")
+            months_step = int(months_step)
+            k = 0
+            while True:
+                ymd = _core._shift_months(Y, M, D, k * months_step)
+                moved = first._moved_by_days(_core._ymd_to_days(*ymd) - start_days, ymd)
+                if reached(moved.ticks):
+                    return
+                yield moved
+                k += 1
+
+        delta = _seconds_to_ticks(step * cls.TIME_UNITS[unit], tps)
+        if not delta:
+            raise ValueError(f"step is shorter than a tick (1/{tps} s)")
+        day = 86400 * tps
+        current_day = None
+        ticks = base
+        while not reached(ticks):
+            days, rem = divmod(abs(ticks), day)
+            if days != current_day:  # only crossing a day boundary touches the calendar
+                current_day = days
+                ymd = _core._days_to_ymd(days)
+            value = cls.from_ticks(ticks, drift=drift)
+            value.output = [[*ymd, *first._ticks_to_time(rem)], "fulldat"]
+            yield value
+            ticks += delta
+
+    def advance(self, seconds: dat | float | int) -> TickDat:
+        "dat.advance in ticks, exact for ints and same resolution TickDats"
+        ticks = self._other_ticks(seconds)
+        if ticks is None:
+            raise TypeError(f"can't advance a TickDat by {type(seconds).__name__}")
+        return self._advance_ticks(round(ticks))
+
+    def __isub__(self, other) -> TickDat:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self._advance_ticks(-round(ticks))
+
+    def _advance_ticks(self, ticks: int) -> TickDat:
+        old = self.ticks
+        self.ticks = new = old + ticks
+        self.epoch_type = BC if new < 0 else AC
+        output = self._output
+        if output is None:
+            return self
+        if old < 0 or new < 0:
+            self._output = None
+            return self
+        day = 86400 * self.TICKS_PER_SECOND
+        days, rem = divmod(new, day)
+        ymd = output[0][0:3] if days == old // day else _core._days_to_ymd(days)
+        self._output = [[*ymd, *self._ticks_to_time(rem)], output[1]]
+        return self
+
+    #-----Tick-Conversions-------
+    def ticks_to_date(self, ticks: int) -> list:
+        "integer twin of convert_rawtime_to_date, seconds keep the tick resolution"
+        tps = self.TICKS_PER_SECOND
+        days, rem = divmod(ticks, 86400 * tps)
+        return [*_core._days_to_ymd(days), *self._ticks_to_time(rem)]
+
+    def _ticks_to_time(self, ticks: int) -> list:
+        "[h, mi, s] of the ticks elapsed since midnight"
+        tps = self.TICKS_PER_SECOND
+        h, rem = divmod(ticks, 3600 * tps)
+        i, rem = divmod(rem, 60 * tps)
+        return [h, i, rem / tps]
+
+    def values_to_ticks(self, value: list[int], epoch_type: EpochType = AC) -> int:
+        "values_to_rawtime in ticks, whole fields are added as ints and only the seconds field is rounded to a tick"
+        tps = self.TICKS_PER_SECOND
+        vals = {'y':0, 'm':1, 'd':1, 'h':0, 'mi':0, 's':0}
+        for key, item in zip(self.template, value):
+            if key in vals:
+                vals[key] = item
+        if self.LEGACY_CALENDAR or not self.is_normalized(vals['y'], vals['m'], vals['d'], vals['h'], vals['mi'], vals['s']):
+            vals = self.normalize_full(vals)
+        whole = (_core._ymd_to_days(int(vals['y']), int(vals['m']), int(vals['d'])) * 86400 + int(vals['h']) * 3600 + int(vals['mi']) * 60) * tps
+        total = whole + _seconds_to_ticks(vals['s'], tps) + _seconds_to_ticks(self.drift, tps)
+        return -total if epoch_type == BC else total
+
+    def finalize_full_dat(self, value: list[int], epoch_type: EpochType = AC, output_type="fulldat") -> TickDat:
+        self.ticks = self.values_to_ticks(value, epoch_type)
+        if self.ticks >= 0 and output_type == "fulldat":
+            self.output = None
+        else:
+            self.output = [self.ticks_to_date(self.ticks), output_type]
+        dat_support.__init__(self)
+        return self
+
+    def _other_ticks(self, other) -> int | Fraction | None:
+        """
+        `other` in ticks of this class: an int when exact (same resolution TickDats, int seconds),
+        a Fraction for float seconds / other resolutions, None for unsupported types
+        """
+        tps = self.TICKS_PER_SECOND
+        if isinstance(other, TickDat):
+            if other.TICKS_PER_SECOND == tps:
+                return other.ticks
+            return Fraction(other.ticks * tps, other.TICKS_PER_SECOND)
+        if isinstance(other, Maths_Support):
+            other = other.rawtime
+        if isinstance(other, int):
+            return other * tps
+        if isinstance(other, float):
+            return Fraction(other) * tps
+        return None
+
+    #-----Maths-------
+    def __add__(self, other) -> TickDat:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.from_ticks(self.ticks + round(ticks))
+
+    def __sub__(self, other) -> TickDat | Duration:
+        "TickDat - dat is a Duration (exact down to the tick for spans up to decades), anything else a TickDat"
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        if isinstance(other, dat):
+            return Duration(float((self.ticks - ticks) / self.TICKS_PER_SECOND))
+        return self.from_ticks(self.ticks - round(ticks))
+
+    def __mul__(self, other) -> TickDat:
+        if isinstance(other, int):
+            return self.from_ticks(self.ticks * other)
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        # rawtime * rawtime like Maths_Support, in seconds
+        return self.from_ticks(round(Fraction(self.ticks) * ticks / self.TICKS_PER_SECOND))
+
+    def __truediv__(self, other) -> TickDat:
+        if isinstance(other, int):
+            return self.from_ticks(round(Fraction(self.ticks, other)))
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.from_ticks(round(Fraction(self.ticks) / ticks * self.TICKS_PER_SECOND))
+
+    def __floordiv__(self, other) -> TickDat:
+        "whole seconds, same as `rawtime // other` on float dats"
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.from_ticks(self.ticks // ticks * self.TICKS_PER_SECOND)
+
+    def __mod__(self, other) -> float:
+        "remainder in seconds, like Maths_Support.__mod__"
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return float(self.ticks % ticks / self.TICKS_PER_SECOND)
+
+    def __pow__(self, other) -> TickDat:
+        if isinstance(other, (Maths_Support, int, float)):
+            exponent = other.rawtime if isinstance(other, Maths_Support) else other
+            return type(self).operand(self.rawtime ** exponent)
+        return NotImplemented
+
+    def __eq__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks == ticks
+
+    def __ne__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks != ticks
+
+    def __lt__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks < ticks
+
+    def __le__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks <= ticks
+
+    def __gt__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks > ticks
+
+    def __ge__(self, other) -> bool:
+        ticks = self._other_ticks(other)
+        if ticks is None:
+            return NotImplemented
+        return self.ticks >= ticks
+
+    def __hash__(self) -> int:
+        """
+        hash of the exact number of seconds `ticks / TICKS_PER_SECOND`, computed the way python hashes a Fraction,\n
+        so it agrees with __eq__: a TickDat hashes like the int / float / dat rawtime it is equal to
+        """
+        ticks = self.ticks
+        seconds, rest = divmod(ticks, self.TICKS_PER_SECOND)
+        if not rest:
+            return hash(seconds)
+        value = abs(ticks) % _HASH_MODULUS * _hash_inverse(self.TICKS_PER_SECOND) % _HASH_MODULUS
+        value = -value if ticks < 0 else value
+        return -2 if value == -1 else value
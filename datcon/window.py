@@ -0,0 +1,154 @@
+from __future__ import annotations
+from collections import deque
+from heapq import heappush, heappop
+
+from .datcon import dat, Duration, _key
+
+__all__ = ["SlidingWindow"]
+
+class SlidingWindow:
+    """Time based sliding window over `(dat, value)` events, holding the events of the last `span` seconds: `(now - span, now]`, `now` being the latest rawtime seen (or given to advance_to). count, sum, min, max, mean and rate are kept up to date as events come in, amortized O(1) per event: a deque ring buffer with running count / sum, plus monotonic deques for min and max that drop a value as soon as a newer one makes it irrelevant. Events may arrive up to `lateness` seconds out of order; they wait in a small heap until no earlier event can still be accepted and are then committed in order, queries fold the waiting events in so results are exact right away. Events later than that are dropped and counted in `dropped`."""
+    __slots__ = ("span", "lateness", "dropped", "_now", "_events", "_count", "_sum", "_mins", "_maxes", "_pending", "_sequence")
+
+    def __init__(self, span: Duration | float | int, *, lateness: Duration | float | int = 0):
+        self.span:float = float(_key(span))
+        self.lateness:float = float(_key(lateness))
+        if self.span <= 0 or self.lateness < 0:
+            raise ValueError("span has to be positive and lateness non negative")
+        self.dropped:int = 0  # events that came in more than `lateness` seconds late
+        self._now:float | None = None
+        self._events:deque = deque()  # committed (rawtime, value), in rawtime order
+        self._count:int = 0
+        self._sum:float = 0.0
+        self._mins:deque = deque()  # (rawtime, value) with increasing values, front is the window minimum
+        self._maxes:deque = deque()  # (rawtime, value) with decreasing values, front is the window maximum
+        self._pending:list = []  # heap of (rawtime, sequence, value) still inside the lateness allowance
+        self._sequence:int = 0
+
+    def __repr__(self) -> str:
+        return f"SlidingWindow(span={self.span:g}, lateness={self.lateness:g}, count={self.count})"
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def now(self) -> float | None:
+        "rawtime the window currently ends at, None before the first event"
+        return self._now
+
+    def add(self, when: dat | float | int, value: float | int = 1) -> bool:
+        """
+        records an event at `when` (a dat or a rawtime) carrying `value`, moving the window end forward if it is the latest so far,\n
+        returns False (and counts it in `dropped`) when the event is more than `lateness` seconds older than the window end
+        """
+        raw = _key(when)
+        now = self._now
+        if now is not None and raw < now - self.lateness:
+            self.dropped += 1
+            return False
+        if now is None or raw > now:
+            self._now = now = raw
+        if not self.lateness:
+            self._commit(raw, value)
+        else:
+            heappush(self._pending, (raw, self._sequence, value))
+            self._sequence += 1
+            self._release(now - self.lateness)
+        self._evict(now - self.span)
+        return True
+
+    def extend(self, events) -> int:
+        "adds every `(when, value)` pair of `events`, returns how many were accepted"
+        add = self.add
+        return sum(add(when, value) for when, value in events)
+
+    def advance_to(self, when: dat | float | int) -> None:
+        "moves the window end to `when` without an event (time passing), expiring what falls out of it"
+        raw = _key(when)
+        if self._now is not None and raw <= self._now:
+            return
+        self._now = raw
+        self._release(raw - self.lateness)
+        self._evict(raw - self.span)
+
+    def _commit(self, raw: float, value) -> None:
+        self._events.append((raw, value))
+        self._count += 1
+        self._sum += value
+        mins = self._mins
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((raw, value))
+        maxes = self._maxes
+        while maxes and maxes[-1][1] <= value:
+            maxes.pop()
+        maxes.append((raw, value))
+
+    def _release(self, final: float) -> None:
+        "commits the waiting events no accepted event can come before anymore"
+        pending = self._pending
+        while pending and pending[0][0] <= final:
+            raw, _, value = heappop(pending)
+            self._commit(raw, value)
+
+    def _evict(self, cutoff: float) -> None:
+        "drops the committed events at or before `cutoff`"
+        events = self._events
+        while events and events[0][0] <= cutoff:
+            _, value = events.popleft()
+            self._count -= 1
+            self._sum -= value
+        if not self._count:
+            self._sum = 0.0  # no rounding residue left behind by the running sum
+        mins, maxes = self._mins, self._maxes
+        while mins and mins[0][0] <= cutoff:
+            mins.popleft()
+        while maxes and maxes[0][0] <= cutoff:
+            maxes.popleft()
+
+    def _waiting(self) -> list:
+        "values of the events still waiting in the lateness heap that are inside the window"
+        if not self._pending:
+            return []
+        cutoff = self._now - self.span
+        return [value for raw, _, value in self._pending if raw > cutoff]
+
+    #-----Aggregates-------
+    @property
+    def count(self) -> int:
+        return self._count + len(self._waiting())
+
+    @property
+    def sum(self) -> float:
+        return self._sum + sum(self._waiting())
+
+    @property
+    def min(self) -> float | None:
+        "smallest value in the window, None when it is empty"
+        candidates = self._waiting()
+        if self._mins:
+            candidates.append(self._mins[0][1])
+        return min(candidates) if candidates else None
+
+    @property
+    def max(self) -> float | None:
+        "largest value in the window, None when it is empty"
+        candidates = self._waiting()
+        if self._maxes:
+            candidates.append(self._maxes[0][1])
+        return max(candidates) if candidates else None
+
+    @property
+    def mean(self) -> float | None:
+        count = self.count
+        return self.sum / count if count else None
+
+    @property
+    def rate(self) -> float:
+        "events per second over the window span"
+        return self.count / self.span
+
+    def snapshot(self) -> dict:
+        "every aggregate at once: `{'now', 'count', 'sum', 'min', 'max', 'mean', 'rate', 'dropped'}`"
+        return {"now": self._now, "count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+                "mean": self.mean, "rate": self.rate, "dropped": self.dropped}
@@ -15,4 +15,5 @@ setup(
     long_description_content_type="text/markdown",
     author="Envisver",
     python_requires=">=3.7",
+    extras_require={"numpy": ["numpy"]},
 )
@@ -0,0 +1,73 @@
+"""
+Cross checks of the closed form calendar engine against the original year by year loops (`LEGACY_CALENDAR`),
+every other part of datcon (ranges, buckets, offsets, ticks, columnar arrays) is built on these conversions
+"""
+import random
+
+import pytest
+
+from datcon import dat
+from datcon.datcon import _days_to_ymd, _ymd_to_days, _days_before_year
+
+class LegacyDat(dat):
+    LEGACY_CALENDAR = True
+
+def _boundary_days(last_year: int = 3000) -> list[int]:
+    "day counts around every year start and the end of february of the century / leap years up to `last_year`"
+    days = []
+    for year in list(range(0, 12)) + list(range(96, last_year, 100)) + list(range(99, last_year, 100)) + list(range(400, last_year, 400)):
+        for month, day in ((1, 1), (2, 28), (3, 1), (12, 31)):
+            first = _ymd_to_days(year, month, day)
+            days += [first - 1, first, first + 1]
+        days.append(_ymd_to_days(year, 2, 1) + 28)  # feb 29 on leap years, mar 1 otherwise
+    return [n for n in days if n >= 0]
+
+@pytest.fixture(scope="module")
+def sample_rawtimes() -> list[float]:
+    rng = random.Random(20240101)
+    limit = _days_before_year(3000) * 86400
+    rawtimes = [float(n * 86400 + rng.randrange(86400)) for n in _boundary_days()]
+    rawtimes += [rng.uniform(0, limit) for _ in range(1500)]
+    rawtimes += [float(rng.randrange(limit)) for _ in range(500)]
+    return rawtimes
+
+def test_rawtime_to_date_matches_legacy(sample_rawtimes):
+    engine, legacy = dat(), LegacyDat()
+    for raw in sample_rawtimes:
+        assert engine.convert_rawtime_to_date(raw) == legacy.convert_rawtime_to_date(raw), raw
+
+def test_days_to_ymd_round_trips():
+    for days in list(range(0, 3 * 146097 + 10)) + _boundary_days(20000):
+        assert _ymd_to_days(*_days_to_ymd(days)) == days, days
+
+def test_values_to_rawtime_matches_legacy():
+    "the normalized fast path and _ymd_to_days give the rawtime the legacy normalize_full + day loop gives"
+    rng = random.Random(7)
+    engine, legacy = dat(), LegacyDat()
+    for item in (engine, legacy):
+        item.template = dat.DEFAULT_TEMPLATE
+    for _ in range(3000):
+        year = rng.randrange(0, 3000)
+        month = rng.randrange(1, 13)
+        day = rng.randrange(1, 29 if month == 2 else 31)
+        value = [year, month, day, rng.randrange(24), rng.randrange(60), round(rng.uniform(0, 60), 4)]
+        assert engine.values_to_rawtime(value) == legacy.values_to_rawtime(value), value
+
+def test_unnormalized_values_match_legacy():
+    "out of range fields (day 0, month 13, 25 hours...) are carried over the same way by both engines"
+    rng = random.Random(11)
+    engine, legacy = dat(), LegacyDat()
+    for item in (engine, legacy):
+        item.template = dat.DEFAULT_TEMPLATE
+    for _ in range(1000):
+        value = [rng.randrange(1, 2500), rng.randrange(0, 30), rng.randrange(0, 70), rng.randrange(0, 50), rng.randrange(0, 130), rng.uniform(0, 200)]
+        assert engine.values_to_rawtime(value) == pytest.approx(legacy.values_to_rawtime(value), abs=1e-6), value
+
+def test_exact_years_and_months_match_legacy():
+    rng = random.Random(3)
+    for _ in range(150):
+        raw = rng.uniform(0, _days_before_year(2100) * 86400)
+        engine, legacy = dat.operand(raw), LegacyDat.operand(raw)
+        engine.converter = legacy.converter = 1
+        assert engine.year == pytest.approx(legacy.year, rel=1e-12), raw
+        assert engine.month == pytest.approx(legacy.month, rel=1e-12), raw
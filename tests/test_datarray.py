@@ -0,0 +1,40 @@
+"""
+The vectorized calendar of DatArray against the scalar engine it mirrors
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from datcon import dat, DatArray
+from datcon.datcon import _days_to_ymd, _ymd_to_days, _days_before_year
+from datcon.datarray import _days_to_ymd_many, _month_start_days_many, convert_rawtime_to_date_many
+
+def test_days_to_ymd_many_matches_scalar():
+    rng = random.Random(5)
+    days = list(range(0, 2 * 146097 + 10)) + [rng.randrange(0, 4_000_000) for _ in range(50000)]
+    Y, M, D = _days_to_ymd_many(np.array(days, dtype=np.int64))
+    assert list(zip(Y.tolist(), M.tolist(), D.tolist())) == [tuple(_days_to_ymd(n)) for n in days]
+
+def test_month_start_days_many_matches_scalar():
+    years = np.repeat(np.arange(0, 2401), 12)
+    months = np.tile(np.arange(1, 13), 2401)
+    expected = [_ymd_to_days(int(y), int(m), 1) for y, m in zip(years, months)]
+    assert _month_start_days_many(years, months).tolist() == expected
+
+def test_rawtime_to_date_many_matches_scalar():
+    rng = random.Random(9)
+    rawtimes = [rng.uniform(0, _days_before_year(3000) * 86400) for _ in range(20000)]
+    columns = convert_rawtime_to_date_many(np.array(rawtimes))
+    engine = dat()
+    for n, raw in enumerate(rawtimes):
+        assert [column[n].item() for column in columns] == engine.convert_rawtime_to_date(raw), raw
+
+def test_components_match_dats():
+    rng = random.Random(13)
+    array = DatArray([rng.uniform(0, _days_before_year(2500) * 86400) for _ in range(2000)], drift=60)
+    columns = array.components()
+    for n, item in enumerate(array.to_dats()):
+        assert [column[n].item() for column in columns] == item.data
+        assert item.drift == 60.0